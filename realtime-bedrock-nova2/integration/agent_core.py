@@ -1,46 +1,60 @@
 import boto3
 import json
+import orjson
 import os
 
 region = os.environ.get("AWS_DEFAULT_REGION", "us-east-1")
 
-ARNS = {}
-if len(ARNS.keys()) == 0:
-    # Get AgentCore Runtime ARNS
-    agentcore_control = boto3.client('bedrock-agentcore-control', region)
-    rt_response= agentcore_control.list_agent_runtimes()
-    for rt in rt_response["agentRuntimes"]:
-        agent_rt_name = rt["agentRuntimeName"]
-        ARNS[agent_rt_name] = rt["agentRuntimeArn"]
+# Get AgentCore Runtime ARNS, keyed by lowercased runtime name
+agentcore_control = boto3.client('bedrock-agentcore-control', region_name=region)
+paginator = agentcore_control.get_paginator('list_agent_runtimes')
+ARNS = {
+    rt["agentRuntimeName"].lower(): rt["agentRuntimeArn"]
+    for page in paginator.paginate()
+    for rt in page["agentRuntimes"]
+}
 
-region = os.environ.get("AWS_DEFAULT_REGION", "us-east-1")
 agentcore_client = boto3.client('bedrock-agentcore',region_name=region)
 
+SSE_CHUNK_SIZE = 64 * 1024
+SSE_DATA_PREFIX = b"data: "
+
+def _read_sse_data(stream):
+    """Collect the `data: ` payloads of an event stream, reading it in large chunks"""
+    content = []
+    buf = bytearray()
+    for chunk in stream.iter_chunks(chunk_size=SSE_CHUNK_SIZE):
+        buf += chunk
+        start = 0
+        end = buf.find(b"\n", start)
+        while end != -1:
+            line = buf[start:end].rstrip(b"\r")
+            if line.startswith(SSE_DATA_PREFIX):
+                content.append(bytes(line[len(SSE_DATA_PREFIX):]))
+            start = end + 1
+            end = buf.find(b"\n", start)
+        del buf[:start]
+    line = buf.rstrip(b"\r")
+    if line.startswith(SSE_DATA_PREFIX):
+        content.append(bytes(line[len(SSE_DATA_PREFIX):]))
+    return b"\n".join(content).decode("utf-8")
+
 def invoke_agent_core(tool_name, payload):
     try:
-        global ARNS
         arn = ARNS.get(tool_name.lower())
         if not arn:
             return {"result": "AgentCore runtime doesn't exist"}
-        if isinstance(payload, dict):
-            payload = json.dumps({"account_id":"940y22688","query":"account balance"})
+        # Tool content arrives as a JSON string already; only serialize other payloads
+        body = payload if isinstance(payload, (bytes, str)) else orjson.dumps(payload)
 
         boto3_response = agentcore_client.invoke_agent_runtime(
             agentRuntimeArn=arn,
             qualifier="DEFAULT",
-            payload=json.dumps(payload)
+            payload=body
         )
 
         if "text/event-stream" in boto3_response.get("contentType", ""):
-            content = []
-            for line in boto3_response["response"].iter_lines(chunk_size=1):
-                if line:
-                    line = line.decode("utf-8")
-                    if line.startswith("data: "):
-                        line = line[6:]
-                        print(line)
-                        content.append(line)
-            return "\n".join(content)
+            return _read_sse_data(boto3_response["response"])
         else:
             try:
                 events = []
@@ -1,12 +1,26 @@
 import asyncio
+import collections
+import functools
 import json
-import base64
+import orjson
+try:
+    # SIMD base64 codec
+    from pybase64 import b64decode, b64encode
+except ImportError:
+    # binascii skips the argument handling of the base64 module wrappers
+    import binascii
+    b64decode = binascii.a2b_base64
+
+    def b64encode(data):
+        return binascii.b2a_base64(data, newline=False)
 import warnings
-import uuid
+import itertools
+import os
 from s2s_events import S2sEvent
 import time
+from concurrent.futures import ThreadPoolExecutor
 from aws_sdk_bedrock_runtime.client import BedrockRuntimeClient, InvokeModelWithBidirectionalStreamOperationInput
-from aws_sdk_bedrock_runtime.models import InvokeModelWithBidirectionalStreamInputChunk, BidirectionalInputPayloadPart
+from aws_sdk_bedrock_runtime.models import InvokeModelWithBidirectionalStreamInputChunk, BidirectionalInputPayloadPart, ValidationException
 from aws_sdk_bedrock_runtime.config import Config
 from smithy_aws_core.identity.environment import EnvironmentCredentialsResolver
 from integration import inline_agent, bedrock_knowledge_bases as kb, agent_core
@@ -16,11 +30,98 @@ warnings.filterwarnings("ignore")
 
 DEBUG = False
 
+# Upper bound on buffered audio chunks waiting to be sent to Bedrock
+AUDIO_INPUT_BUFFER_SIZE = 64
+
+# Upper bound on events waiting to be forwarded to the WebSocket client
+OUTPUT_QUEUE_SIZE = 256
+
+# Maximum number of buffered audio chunks coalesced into one audioInput event
+AUDIO_COALESCE_MAX_CHUNKS = 4
+
+# Pre-serialized control events; %b slots take orjson-encoded (quoted, escaped) names
+CONTENT_START_USER_TEXT_TEMPLATE = (
+    b'{"event":{"contentStart":{"promptName":%b,"contentName":%b,"type":"TEXT",'
+    b'"interactive":true,"role":"USER","textInputConfiguration":{"mediaType":"text/plain"}}}}'
+)
+CONTENT_END_TEMPLATE = b'{"event":{"contentEnd":{"promptName":%b,"contentName":%b}}}'
+
+# Tool calls are run by a fixed pool of workers fed from a bounded queue
+TOOL_QUEUE_SIZE = 8
+TOOL_WORKER_COUNT = 4
+
+# Tool result returned to the model when the tool queue is full
+TOOL_BUSY_RESULT = {"result": "Too many tool requests are in progress. Please try again shortly."}
+
+# Cores the tool threads run on; None keeps the process affinity
+_tool_thread_cores = None
+
+
+def set_tool_thread_affinity(cores):
+    """Run tool threads started from now on on the given cores (Linux only)."""
+    global _tool_thread_cores
+    _tool_thread_cores = cores
+
+
+def _init_tool_thread():
+    if _tool_thread_cores:
+        os.sched_setaffinity(0, _tool_thread_cores)
+
+
+# Blocking tool clients (boto3) run here so they never stall the event loop
+TOOL_EXECUTOR = ThreadPoolExecutor(
+    max_workers=TOOL_WORKER_COUNT, thread_name_prefix="s2s-tool", initializer=_init_tool_thread
+)
+
 def debug_print(message):
     """Print only if debug mode is enabled"""
     if DEBUG:
         print(message)
 
+def now_ms():
+    """Milliseconds since epoch, computed in integer arithmetic."""
+    return time.time_ns() // 1_000_000
+
+def clear_queue(queue):
+    """Drop every pending item of an asyncio.Queue in O(1).
+
+    Clears the underlying deque directly instead of draining with get_nowait()
+    so large audio backlogs are discarded without a Python loop. Waiting
+    consumers keep their reference to the same queue object.
+    """
+    queue._queue.clear()
+    queue._unfinished_tasks = 0
+    queue._finished.set()
+
+
+@functools.lru_cache(maxsize=None)
+def get_bedrock_client(region):
+    """Return the process-wide Bedrock runtime client for a region.
+
+    Sessions share the client (and its warm connections); only the
+    bidirectional stream is opened per session.
+    """
+    config = Config(
+        endpoint_uri=f"https://bedrock-runtime.{region}.amazonaws.com",
+        region=region,
+        aws_credentials_identity_resolver=EnvironmentCredentialsResolver(),
+    )
+    return BedrockRuntimeClient(config=config)
+
+
+def join_base64_chunks(chunks):
+    """Join base64 chunks into a single base64 payload.
+
+    Chunks that end on a 4-character boundary without padding can be
+    concatenated as-is; otherwise they are padded, decoded, joined and
+    re-encoded.
+    """
+    if len(chunks) == 1:
+        return chunks[0]
+    if all(len(chunk) % 4 == 0 and not chunk.endswith(b'=') for chunk in chunks[:-1]):
+        return b''.join(chunks)
+    return b64encode(b''.join(b64decode(chunk + b'=' * (-len(chunk) % 4)) for chunk in chunks))
+
 
 class S2sSessionManager:
     """Manages bidirectional streaming with AWS Bedrock using asyncio"""
@@ -30,11 +131,13 @@ class S2sSessionManager:
         self.model_id = model_id
         self.region = region
         
-        # Audio and output queues
-        self.audio_input_queue = asyncio.Queue()
-        self.output_queue = asyncio.Queue()
+        # Audio ring buffer (single producer/consumer) and output queue
+        self.audio_input_buffer = collections.deque(maxlen=AUDIO_INPUT_BUFFER_SIZE)
+        self.audio_input_ready = asyncio.Event()
+        self.output_queue = asyncio.Queue(maxsize=OUTPUT_QUEUE_SIZE)
         
         self.response_task = None
+        self.audio_task = None
         self.stream = None
         self.is_active = False
         self.bedrock_client = None
@@ -49,48 +152,35 @@ class S2sSessionManager:
         self.mcp_loc_client = mcp_client
         self.strands_agent = strands_agent
         
-        # Track active tool processing tasks
-        self.tool_processing_tasks = set()
+        # Tool processing jobs and the workers consuming them
+        self.tool_queue = asyncio.Queue(maxsize=TOOL_QUEUE_SIZE)
+        self.tool_workers = []
+        # Busy replies for tool calls rejected by a full queue
+        self.tool_reply_tasks = set()
+        # Serializes teardowns, e.g. reset() racing the response loop closing itself
+        self.teardown_lock = asyncio.Lock()
+
+        # Built-in tools, keyed by lowercased tool name
+        self.tool_handlers = {
+            "getdatetool": self._tool_get_date,
+            "getkbtool": self._tool_get_kb,
+            "getslowtool": self._tool_get_slow,
+            "getlocationtool": self._tool_get_location,
+            "externalagent": self._tool_external_agent,
+            "getbookingdetails": self._tool_get_booking_details,
+        }
+
+        # Content name generator: random per-session prefix plus a counter
+        self.id_prefix = os.urandom(12).hex()
+        self.id_counter = itertools.count()
+
+        # Serialized audioInput event prefix, cached per (prompt_name, content_name)
+        self.audio_event_prefix_key = None
+        self.audio_event_prefix = None
 
     def _initialize_client(self):
         """Initialize the Bedrock client."""
-        config = Config(
-            endpoint_uri=f"https://bedrock-runtime.{self.region}.amazonaws.com",
-            region=self.region,
-            aws_credentials_identity_resolver=EnvironmentCredentialsResolver(),
-        )
-        self.bedrock_client = BedrockRuntimeClient(config=config)
-
-    def reset_session_state(self):
-        """Reset session state for a new session."""
-        # Cancel any ongoing tool processing tasks
-        for task in list(self.tool_processing_tasks):
-            if not task.done():
-                task.cancel()
-        self.tool_processing_tasks.clear()
-        
-        # Clear queues
-        while not self.audio_input_queue.empty():
-            try:
-                self.audio_input_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
-        
-        while not self.output_queue.empty():
-            try:
-                self.output_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
-        
-        # Reset tool use state
-        self.toolUseContent = ""
-        self.toolUseId = ""
-        self.toolName = ""
-        
-        # Reset session information
-        self.prompt_name = None
-        self.content_name = None
-        self.audio_content_name = None
+        self.bedrock_client = get_bedrock_client(self.region)
 
     async def initialize_stream(self):
         """Initialize the bidirectional stream with Bedrock."""
@@ -113,7 +203,10 @@ class S2sSessionManager:
             self.response_task = asyncio.create_task(self._process_responses())
 
             # Start processing audio input
-            asyncio.create_task(self._process_audio_input())
+            self.audio_task = asyncio.create_task(self._process_audio_input())
+
+            # Start the tool processing workers
+            self._start_tool_workers()
             
             # Wait a bit to ensure everything is set up
             await asyncio.sleep(0.1)
@@ -125,6 +218,11 @@ class S2sSessionManager:
             print(f"Failed to initialize stream: {str(e)}")
             raise
     
+    def _new_id(self):
+        """Return a unique, UUID-formatted content name without hitting the OS RNG."""
+        h = f"{self.id_prefix}{next(self.id_counter) & 0xffffffff:08x}"
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
     async def send_raw_event(self, event_data):
         try:
             """Send a raw event to the Bedrock stream."""
@@ -132,42 +230,86 @@ class S2sSessionManager:
                 debug_print("Stream not initialized or closed")
                 return
             
-            event_json = json.dumps(event_data)
+            event_json = orjson.dumps(event_data)
             #if "audioInput" not in event_data["event"]:
             #    print(event_json)
-            event = InvokeModelWithBidirectionalStreamInputChunk(
-                value=BidirectionalInputPayloadPart(bytes_=event_json.encode('utf-8'))
-            )
-            await self.stream.input_stream.send(event)
+            await self._send_event_bytes(event_json)
 
             # Close session
             if "sessionEnd" in event_data["event"]:
-                self.close()
+                await self.close()
             
         except Exception as e:
             debug_print(f"Error sending event: {str(e)}")
     
+    async def send_raw_events(self, events):
+        """Serialize a group of events up front and send them back to back.
+
+        Bedrock expects one event per payload part, so the events are not
+        concatenated; the group is simply written without interleaving other
+        serialization work between the sends. Events already serialized to
+        bytes are sent as-is.
+        """
+        try:
+            if not self.stream or not self.is_active:
+                debug_print("Stream not initialized or closed")
+                return
+
+            for event_bytes in [e if isinstance(e, bytes) else orjson.dumps(e) for e in events]:
+                await self._send_event_bytes(event_bytes)
+
+        except Exception as e:
+            debug_print(f"Error sending events: {str(e)}")
+
+    async def _send_event_bytes(self, event_bytes):
+        """Send an already serialized event to the Bedrock stream."""
+        event = InvokeModelWithBidirectionalStreamInputChunk(
+            value=BidirectionalInputPayloadPart(bytes_=event_bytes)
+        )
+        await self.stream.input_stream.send(event)
+
+    def _get_audio_event_prefix(self, prompt_name, content_name):
+        """Return the serialized audioInput event up to the opening quote of its content."""
+        key = (prompt_name, content_name)
+        if key != self.audio_event_prefix_key:
+            self.audio_event_prefix = (
+                '{"event":{"audioInput":{"promptName":%s,"contentName":%s,"content":"'
+                % (json.dumps(prompt_name), json.dumps(content_name))
+            ).encode('utf-8')
+            self.audio_event_prefix_key = key
+        return self.audio_event_prefix
+
     async def _process_audio_input(self):
-        """Process audio input from the queue and send to Bedrock."""
+        """Process audio input from the ring buffer and send to Bedrock."""
         while self.is_active:
             try:
-                # Get audio data from the queue
-                data = await self.audio_input_queue.get()
-                
-                # Extract data from the queue item
-                prompt_name = data.get('prompt_name')
-                content_name = data.get('content_name')
-                audio_bytes = data.get('audio_bytes')
-                
-                if not audio_bytes or not prompt_name or not content_name:
-                    debug_print("Missing required audio data properties")
-                    continue
+                # Wait until the producer signals new audio, then drain the buffer
+                await self.audio_input_ready.wait()
+                self.audio_input_ready.clear()
 
-                # Create the audio input event
-                audio_event = S2sEvent.audio_input(prompt_name, content_name, audio_bytes.decode('utf-8') if isinstance(audio_bytes, bytes) else audio_bytes)
-                
-                # Send the event
-                await self.send_raw_event(audio_event)
+                while self.audio_input_buffer and self.is_active:
+                    prompt_name, content_name, audio_bytes = self.audio_input_buffer.popleft()
+                    
+                    if not audio_bytes or not prompt_name or not content_name:
+                        debug_print("Missing required audio data properties")
+                        continue
+
+                    # Coalesce chunks already waiting for the same content into one event
+                    chunks = [audio_bytes]
+                    while len(chunks) < AUDIO_COALESCE_MAX_CHUNKS and self.audio_input_buffer:
+                        next_prompt_name, next_content_name, next_audio_bytes = self.audio_input_buffer[0]
+                        if next_prompt_name != prompt_name or next_content_name != content_name or not next_audio_bytes:
+                            break
+                        chunks.append(next_audio_bytes)
+                        self.audio_input_buffer.popleft()
+                    audio_bytes = join_base64_chunks(chunks)
+
+                    # Build the audioInput event from the cached prefix; base64 content needs no JSON escaping
+                    prefix = self._get_audio_event_prefix(prompt_name, content_name)
+                    
+                    # Send the event
+                    if self.stream and self.is_active:
+                        await self._send_event_bytes(prefix + audio_bytes + b'"}}}')
                 
             except asyncio.CancelledError:
                 break
@@ -178,14 +320,31 @@ class S2sSessionManager:
                     traceback.print_exc()
     
     def add_audio_chunk(self, prompt_name, content_name, audio_data):
-        """Add an audio chunk to the queue."""
-        # The audio_data is already a base64 string from the frontend
-        self.audio_input_queue.put_nowait({
-            'prompt_name': prompt_name,
-            'content_name': content_name,
-            'audio_bytes': audio_data
-        })
+        """Add an audio chunk to the ring buffer.
+
+        The buffer is bounded; when Bedrock falls behind the oldest chunk is
+        dropped so live audio wins and memory stays constant.
+        """
+        # The audio_data is already base64 from the frontend and Bedrock's audioInput takes
+        # base64 too, so it is never decoded here; keep it as ASCII bytes from here on
+        if isinstance(audio_data, str):
+            audio_data = audio_data.encode('ascii')
+        self.audio_input_buffer.append((prompt_name, content_name, audio_data))
+        self.audio_input_ready.set()
     
+    def put_output(self, event):
+        """Queue an event for the WebSocket client.
+
+        The queue is bounded; if the client cannot keep up the oldest event is
+        dropped so the newest audio wins and memory stays constant.
+        """
+        try:
+            self.output_queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.output_queue.get_nowait()
+            self.output_queue.put_nowait(event)
+            debug_print("Output queue full, dropped oldest event")
+
     async def _process_responses(self):
         """Process incoming responses from Bedrock."""
         while self.is_active:
@@ -194,56 +353,77 @@ class S2sSessionManager:
                 result = await output[1].receive()
                 
                 if result.value and result.value.bytes_:
-                    response_data = result.value.bytes_.decode('utf-8')
+                    response_data = result.value.bytes_
                     
-                    json_data = json.loads(response_data)
-                    json_data["timestamp"] = int(time.time() * 1000)  # Milliseconds since epoch
+                    json_data = orjson.loads(response_data)
+                    json_data["timestamp"] = now_ms()  # Milliseconds since epoch
                     
                     event_name = None
-                    if 'event' in json_data:
-                        event_name = list(json_data["event"].keys())[0]
+                    event = json_data.get('event')
+                    if event is not None:
+                        event_name = next(iter(event))
                         # if event_name == "audioOutput":
                         #     print(json_data)
                         
                         # Handle tool use detection
                         if event_name == 'toolUse':
-                            self.toolUseContent = json_data['event']['toolUse']
-                            self.toolName = json_data['event']['toolUse']['toolName']
-                            self.toolUseId = json_data['event']['toolUse']['toolUseId']
-                            debug_print(f"Tool use detected: {self.toolName}, ID: {self.toolUseId}, "+ json.dumps(json_data['event']))
+                            tool_use = event['toolUse']
+                            self.toolUseContent = tool_use
+                            self.toolName = tool_use['toolName']
+                            self.toolUseId = tool_use['toolUseId']
+                            debug_print(f"Tool use detected: {self.toolName}, ID: {self.toolUseId}, "+ json.dumps(event))
 
                         # Process tool use when content ends
-                        elif event_name == 'contentEnd' and json_data['event'][event_name].get('type') == 'TOOL':
-                            prompt_name = json_data['event']['contentEnd'].get("promptName")
+                        elif event_name == 'contentEnd' and event['contentEnd'].get('type') == 'TOOL':
+                            prompt_name = event['contentEnd'].get("promptName")
                             debug_print("Starting tool processing in background")
-                            # Process tool in background task to avoid blocking
-                            task = asyncio.create_task(
-                                self._handle_tool_processing(prompt_name, self.toolName, self.toolUseContent, self.toolUseId)
-                            )
-                            self.tool_processing_tasks.add(task)
-                            task.add_done_callback(self.tool_processing_tasks.discard)
+                            # Hand the tool to the worker pool; never wait here, this loop carries the audio output
+                            self._enqueue_tool(prompt_name, self.toolName, self.toolUseContent, self.toolUseId)
                     
                     # Put the response in the output queue for forwarding to the frontend
-                    await self.output_queue.put(json_data)
+                    self.put_output(json_data)
 
 
-            except json.JSONDecodeError as ex:
+            except orjson.JSONDecodeError as ex:
                 print(ex)
-                await self.output_queue.put({"raw_data": response_data})
+                self.put_output({"raw_data": response_data.decode('utf-8', errors='replace')})
             except StopAsyncIteration as ex:
                 # Stream has ended
                 print(ex)
+            except ValidationException as e:
+                print(f"Validation error: {e}")
+                break
             except Exception as e:
-                # Handle ValidationException properly
-                if "ValidationException" in str(e):
-                    error_message = str(e)
-                    print(f"Validation error: {error_message}")
-                else:
-                    print(f"Error receiving response: {e}")
+                print(f"Error receiving response: {e}")
+                if DEBUG:
+                    import traceback
+                    traceback.print_exc()
                 break
 
-        self.is_active = False
-        self.close()
+        await self.close()
+
+    async def _tool_worker(self):
+        """Run queued tool jobs one at a time until cancelled."""
+        while True:
+            job = await self.tool_queue.get()
+            try:
+                await self._handle_tool_processing(*job)
+            finally:
+                self.tool_queue.task_done()
+
+    def _enqueue_tool(self, prompt_name, tool_name, tool_use_content, tool_use_id):
+        """Queue a tool call, answering it with a busy result if the queue is full."""
+        try:
+            self.tool_queue.put_nowait((prompt_name, tool_name, tool_use_content, tool_use_id))
+        except asyncio.QueueFull:
+            print(f"[Tool Processing] Queue full, rejecting: {tool_name} with ID: {tool_use_id}")
+            task = asyncio.create_task(self._send_tool_result(prompt_name, tool_use_id, TOOL_BUSY_RESULT))
+            self.tool_reply_tasks.add(task)
+            task.add_done_callback(self.tool_reply_tasks.discard)
+
+    def _start_tool_workers(self):
+        """Start the fixed pool of tool workers."""
+        self.tool_workers = [asyncio.create_task(self._tool_worker()) for _ in range(TOOL_WORKER_COUNT)]
 
     async def _handle_tool_processing(self, prompt_name, tool_name, tool_use_content, tool_use_id):
         """Handle tool processing in background without blocking event processing"""
@@ -251,43 +431,37 @@ class S2sSessionManager:
             print(f"[Tool Processing] Starting: {tool_name} with ID: {tool_use_id}")
             toolResult = await self.processToolUse(tool_name, tool_use_content, prompt_name)
             print(f"[Tool Processing] Completed: {tool_name}")
-                
-            # Send tool start event
-            toolContent = str(uuid.uuid4())
-            tool_start_event = S2sEvent.content_start_tool(prompt_name, toolContent, tool_use_id)
-            await self.send_raw_event(tool_start_event)
-            
-            # Also send tool start event to WebSocket client
-            tool_start_event_copy = tool_start_event.copy()
-            tool_start_event_copy["timestamp"] = int(time.time() * 1000)
-            await self.output_queue.put(tool_start_event_copy)
-            
-            # Send tool result event
+            await self._send_tool_result(prompt_name, tool_use_id, toolResult)
+        except Exception as e:
+            print(f"Error in tool processing: {e}")
+            if DEBUG:
+                import traceback
+                traceback.print_exc()
+
+    async def _send_tool_result(self, prompt_name, tool_use_id, toolResult):
+        """Send a tool result to Bedrock and echo the events to the WebSocket client."""
+        try:
+            toolContent = self._new_id()
             if isinstance(toolResult, dict):
                 content_json_string = json.dumps(toolResult)
             else:
                 content_json_string = toolResult
 
+            # Tool start, tool result and tool content end events
+            tool_start_event = S2sEvent.content_start_tool(prompt_name, toolContent, tool_use_id)
             tool_result_event = S2sEvent.text_input_tool(prompt_name, toolContent, content_json_string)
-            print("Tool result", tool_result_event)
-            await self.send_raw_event(tool_result_event)
-            
-            # Also send tool result event to WebSocket client
-            tool_result_event_copy = tool_result_event.copy()
-            tool_result_event_copy["timestamp"] = int(time.time() * 1000)
-            await self.output_queue.put(tool_result_event_copy)
-
-            # Send tool content end event
             tool_content_end_event = S2sEvent.content_end(prompt_name, toolContent)
-            await self.send_raw_event(tool_content_end_event)
+            print("Tool result", tool_result_event)
+            tool_events = [tool_start_event, tool_result_event, tool_content_end_event]
+            await self.send_raw_events(tool_events)
             
-            # Also send tool content end event to WebSocket client
-            tool_content_end_event_copy = tool_content_end_event.copy()
-            tool_content_end_event_copy["timestamp"] = int(time.time() * 1000)
-            await self.output_queue.put(tool_content_end_event_copy)
+            # Also send the tool events to WebSocket client; they are already serialized, so stamp them in place
+            for tool_event in tool_events:
+                tool_event["timestamp"] = now_ms()
+                self.put_output(tool_event)
             
         except Exception as e:
-            print(f"Error in tool processing: {e}")
+            print(f"Error sending tool result: {e}")
             if DEBUG:
                 import traceback
                 traceback.print_exc()
@@ -314,54 +488,13 @@ class S2sSessionManager:
             
             # AgentCore integration (fallback)
             if toolName.startswith("ac_"):
-                result = agent_core.invoke_agent_core(toolName, content)
-
-            # Simple toolUse to get system time in UTC
-            if toolName == "getdatetool":
-                from datetime import datetime, timezone
-                result = datetime.now(timezone.utc).strftime('%A, %Y-%m-%d %H:%M:%S')
-
-            # Bedrock Knowledge Bases (RAG)
-            if toolName == "getkbtool":
-                result = kb.retrieve_kb(content)
-
-            # Slow tool to demo async tool use behavior
-            if toolName == "getslowtool":
-                result = {"weather":[{"id":801,"main":"Clouds","description":"few clouds","icon":"02d"}],"base":"stations","main":{"temp":52.14,"feels_like":50.56,"temp_min":45.0,"temp_max":58.99,"pressure":1012,"humidity":68},"visibility":16093,"wind":{"speed":8.05,"deg":330},"clouds":{"all":20},"dt":1757676720,"sys":{"type":1,"id":479,"country":"US","sunrise":1522590707,"sunset":1522636288},"timezone":-25200,"id":5809844}
-                await self.send_text(prompt_name, "just say 'Hold on one second while I find the weather information for you.'")
-                await asyncio.sleep(20)  # Wait 10 seconds before returning result
-
-            # MCP integration - location search                        
-            if toolName == "getlocationtool":
-                if self.mcp_loc_client:
-                    result = await self.mcp_loc_client.call_tool(content)
-            
-            # Strands Agent integration - weather questions
-            if toolName == "externalagent":
-                if self.strands_agent:
-                    result = self.strands_agent.query(content)
-
-            # Bedrock Agents integration - Bookings
-            if toolName == "getbookingdetails":
-                try:
-                    # Pass the tool use content (JSON string) directly to the agent
-                    result = await inline_agent.invoke_agent(content)
-                    # Try to parse and format if needed
-                    try:
-                        booking_json = json.loads(result)
-                        if "bookings" in booking_json:
-                            result = await inline_agent.invoke_agent(
-                                f"Format this booking information for the user: {result}"
-                            )
-                    except Exception:
-                        pass  # Not JSON, just return as is
-                    
-                except json.JSONDecodeError as e:
-                    print(f"JSON decode error: {str(e)}")
-                    return {"result": f"Invalid JSON format for booking details: {str(e)}"}
-                except Exception as e:
-                    print(f"Error processing booking details: {str(e)}")
-                    return {"result": f"Error processing booking details: {str(e)}"}
+                result = await asyncio.get_running_loop().run_in_executor(
+                    TOOL_EXECUTOR, agent_core.invoke_agent_core, toolName, content
+                )
+            else:
+                handler = self.tool_handlers.get(toolName)
+                if handler:
+                    result = await handler(content, prompt_name)
 
             if not result:
                 result = "no result found"
@@ -374,76 +507,125 @@ class S2sSessionManager:
                 traceback.print_exc()
             return {"result": "An error occurred while attempting to retrieve information related to the toolUse event."}
 
-    async def send_text(self, prompt_name, text):
-        content_name = str(uuid.uuid4())
-
-        # contentStart
-        content_start_event = S2sEvent.content_start_text(prompt_name, content_name, True, "USER")
-        await self.send_raw_event(content_start_event)
-
-        # textInput
-        text_input_event = S2sEvent.text_input(prompt_name, content_name, text)
-        await self.send_raw_event(text_input_event)
+    async def _tool_get_date(self, content, prompt_name):
+        """Simple toolUse to get system time in UTC"""
+        from datetime import datetime, timezone
+        return datetime.now(timezone.utc).strftime('%A, %Y-%m-%d %H:%M:%S')
+
+    async def _tool_get_kb(self, content, prompt_name):
+        """Bedrock Knowledge Bases (RAG)"""
+        return kb.retrieve_kb(content)
+
+    async def _tool_get_slow(self, content, prompt_name):
+        """Slow tool to demo async tool use behavior"""
+        result = {"weather":[{"id":801,"main":"Clouds","description":"few clouds","icon":"02d"}],"base":"stations","main":{"temp":52.14,"feels_like":50.56,"temp_min":45.0,"temp_max":58.99,"pressure":1012,"humidity":68},"visibility":16093,"wind":{"speed":8.05,"deg":330},"clouds":{"all":20},"dt":1757676720,"sys":{"type":1,"id":479,"country":"US","sunrise":1522590707,"sunset":1522636288},"timezone":-25200,"id":5809844}
+        await self.send_text(prompt_name, "just say 'Hold on one second while I find the weather information for you.'")
+        await asyncio.sleep(20)  # Wait 10 seconds before returning result
+        return result
+
+    async def _tool_get_location(self, content, prompt_name):
+        """MCP integration - location search"""
+        if self.mcp_loc_client:
+            return await self.mcp_loc_client.call_tool(content)
+
+    async def _tool_external_agent(self, content, prompt_name):
+        """Strands Agent integration - weather questions"""
+        if self.strands_agent:
+            return self.strands_agent.query(content)
+
+    async def _tool_get_booking_details(self, content, prompt_name):
+        """Bedrock Agents integration - Bookings"""
+        try:
+            # Pass the tool use content (JSON string) directly to the agent
+            result = await inline_agent.invoke_agent(content)
+            # Try to parse and format if needed
+            try:
+                booking_json = json.loads(result)
+                if "bookings" in booking_json:
+                    result = await inline_agent.invoke_agent(
+                        f"Format this booking information for the user: {result}"
+                    )
+            except Exception:
+                pass  # Not JSON, just return as is
+            return result
+            
+        except json.JSONDecodeError as e:
+            print(f"JSON decode error: {str(e)}")
+            return f"Invalid JSON format for booking details: {str(e)}"
+        except Exception as e:
+            print(f"Error processing booking details: {str(e)}")
+            return f"Error processing booking details: {str(e)}"
 
-        # contentStart
-        content_end_event = S2sEvent.content_end(prompt_name, content_name)
-        await self.send_raw_event(content_end_event)
+    async def send_text(self, prompt_name, text):
+        content_name = self._new_id()
+        names = (orjson.dumps(prompt_name), orjson.dumps(content_name))
+
+        await self.send_raw_events([
+            # contentStart
+            CONTENT_START_USER_TEXT_TEMPLATE % names,
+            # textInput
+            S2sEvent.text_input(prompt_name, content_name, text),
+            # contentEnd
+            CONTENT_END_TEMPLATE % names,
+        ])
 
     async def close(self):
         """Close the stream properly."""
-        if not self.is_active:
-            return
-            
+        await self._teardown()
+
+    async def _teardown(self):
+        """Stop every task of the current stream and close it, whatever is_active says.
+
+        Task references are taken and cleared under the lock, so a later
+        teardown never waits on the same tasks again. The calling task (the
+        response loop closing itself) is left running.
+        """
         self.is_active = False
-        
-        # Cancel any ongoing tool processing tasks
-        for task in list(self.tool_processing_tasks):
-            if not task.done():
+        async with self.teardown_lock:
+            current = asyncio.current_task()
+            tasks = [*self.tool_workers, *self.tool_reply_tasks, self.audio_task, self.response_task]
+            tasks = [task for task in tasks if task is not None and task is not current]
+            stream = self.stream
+            self.tool_workers = []
+            self.audio_task = None
+            self.response_task = None
+            self.stream = None
+
+            # Cancel the tool workers, any ongoing tool processing and the audio task
+            for task in tasks:
                 task.cancel()
-        
-        # Wait for all tool tasks to complete or be cancelled
-        if self.tool_processing_tasks:
-            await asyncio.gather(*self.tool_processing_tasks, return_exceptions=True)
-        self.tool_processing_tasks.clear()
-        
-        # Clear audio queue to prevent processing old audio data
-        while not self.audio_input_queue.empty():
-            try:
-                self.audio_input_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
-        
-        # Clear output queue
-        while not self.output_queue.empty():
-            try:
-                self.output_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
-        
-        # Reset tool use state
-        self.toolUseContent = ""
-        self.toolUseId = ""
-        self.toolName = ""
-        
-        # Reset session information
-        self.prompt_name = None
-        self.content_name = None
-        self.audio_content_name = None
-        
-        if self.stream:
-            try:
-                await self.stream.input_stream.close()
-            except Exception as e:
-                debug_print(f"Error closing stream: {e}")
-        
-        if self.response_task and not self.response_task.done():
-            self.response_task.cancel()
-            try:
-                await self.response_task
-            except asyncio.CancelledError:
-                pass
-        
-        # Set stream to None to ensure it's properly cleaned up
-        self.stream = None
-        self.response_task = None
-        
\ No newline at end of file
+
+            if stream:
+                try:
+                    await stream.input_stream.close()
+                except Exception as e:
+                    debug_print(f"Error closing stream: {e}")
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            # Drop queued tool calls, buffered audio and undelivered output
+            clear_queue(self.tool_queue)
+            self.audio_input_buffer.clear()
+            self.audio_input_ready.clear()
+            clear_queue(self.output_queue)
+
+            # Reset tool use state
+            self.toolUseContent = ""
+            self.toolUseId = ""
+            self.toolName = ""
+
+            # Reset session information
+            self.prompt_name = None
+            self.content_name = None
+            self.audio_content_name = None
+
+    async def reset(self):
+        """Start a new Bedrock session on this manager.
+
+        Closes the current bidirectional stream and opens a fresh one, keeping
+        the shared Bedrock client, queues and tool handlers of this manager.
+        """
+        await self._teardown()
+        self.audio_event_prefix_key = None
+        self.audio_event_prefix = None
+        return await self.initialize_stream()
@@ -4,21 +4,41 @@ from dotenv import load_dotenv
 load_dotenv(override=False)
 import asyncio
 import websockets
-import json
+import orjson
 import logging
+import logging.handlers
+import queue
+import atexit
 import warnings
-from s2s_session_manager import S2sSessionManager
+from s2s_session_manager import S2sSessionManager, set_tool_thread_affinity
 import argparse
 import http.server
 import threading
 import os
 from http import HTTPStatus
+from concurrent.futures import ThreadPoolExecutor
 
 from integration.mcp_client import McpLocationClient
 from integration.strands_agent import StrandsAgent
 
+try:
+    # libuv-based event loop: lower per-send latency for the websocket and Bedrock streams
+    import uvloop
+    LOOP_FACTORY = uvloop.new_event_loop
+except ImportError:
+    # uvloop is not available on Windows; fall back to the default asyncio loop
+    LOOP_FACTORY = None
+
 LOGLEVEL = os.environ.get("LOGLEVEL", "INFO").upper()
-logging.basicConfig(level=LOGLEVEL, format="%(asctime)s %(message)s")
+# Log records are handed to a queue and written by a listener thread,
+# so stream I/O never blocks the event loop
+LOG_QUEUE = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+LOG_LISTENER = logging.handlers.QueueListener(LOG_QUEUE, _log_stream_handler)
+logging.basicConfig(level=LOGLEVEL, handlers=[logging.handlers.QueueHandler(LOG_QUEUE)])
+LOG_LISTENER.start()
+atexit.register(LOG_LISTENER.stop)
 logger = logging.getLogger(__name__)
 
 warnings.filterwarnings("ignore")
@@ -27,30 +47,90 @@ DEBUG = False
 
 def debug_print(message):
     if DEBUG:
-        print(message)
+        logger.debug(message)
 
 MCP_CLIENT = None
 STRANDS_AGENT = None
 
+# Bounds for coalescing queued responses into a single websocket frame
+FORWARD_BATCH_MAX_EVENTS = 16
+FORWARD_BATCH_MAX_BYTES = 16 * 1024
+
+# Seconds to wait for an agent integration (MCP / Strands) to start
+AGENT_STARTUP_TIMEOUT = 5
+
+# Largest client message accepted; audio frames are a few KiB of base64
+WS_MAX_MESSAGE_SIZE = 2**20
+
+# Outgoing buffer high-water mark; audio output bursts fit without pausing the sender
+WS_WRITE_LIMIT = 128 * 1024
+
+try:
+    # Lazy JSON access: audio frames only need three fields out of each message
+    import simdjson
+    JSON_PARSER = simdjson.Parser()
+except ImportError:
+    JSON_PARSER = None
+
+EVENT_PREFIX = '{"event"'
+EVENT_PREFIX_BYTES = EVENT_PREFIX.encode()
+
+
+def parse_client_message(message):
+    """Parse a websocket message into (event_type, payload).
+
+    For audioInput events the payload is just the base64 content read straight
+    off the parsed document (prompt and content names are cached per session
+    from promptStart/contentStart); for any other event it is the full
+    message dict to forward to Bedrock. Messages without an event
+    return (None, None). Raises ValueError on invalid JSON.
+    """
+    # Messages from the UI start with the event key and are never wrapped, so
+    # only look for an API Gateway style 'body' envelope on other messages.
+    # The body is either a JSON string (parsed once more) or an object (used as-is).
+    unwrapped = message.startswith(EVENT_PREFIX if isinstance(message, str) else EVENT_PREFIX_BYTES)
+    if JSON_PARSER is None:
+        data = orjson.loads(message)
+        body = None if unwrapped else data.get('body')
+        if isinstance(body, str):
+            data = orjson.loads(body)
+        elif body is not None:
+            data = body
+    else:
+        # The parser is shared, so no simdjson object may outlive this call
+        data = JSON_PARSER.parse(message)
+        body = None if unwrapped else data.get('body')
+        if isinstance(body, str):
+            del data
+            data = JSON_PARSER.parse(body)
+        elif body is not None:
+            data = body
+
+    event = data.get('event')
+    if not event:
+        return None, None
+    event_type = next(iter(event))
+    if event_type == 'audioInput':
+        return event_type, event['audioInput']['content']
+    return event_type, data if JSON_PARSER is None else data.as_dict()
+
+
+# Health check response body, serialized once
+HEALTH_BODY = '{"status": "healthy"}'
+HEALTH_OK = HEALTH_BODY.encode("utf-8")
+HEALTH_OK_LENGTH = str(len(HEALTH_OK))
+
+
 class HealthCheckHandler(http.server.BaseHTTPRequestHandler):
     def do_GET(self):
-        client_ip = self.client_address[0]
-        logger.info(
-            f"Health check request received from {client_ip} for path: {self.path}"
-        )
-
         if self.path == "/health" or self.path == "/":
-            logger.info(f"Responding with 200 OK to health check from {client_ip}")
             self.send_response(HTTPStatus.OK)
             self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", HEALTH_OK_LENGTH)
             self.end_headers()
-            response = json.dumps({"status": "healthy"})
-            self.wfile.write(response.encode("utf-8"))
-            logger.info(f"Health check response sent: {response}")
+            self.wfile.write(HEALTH_OK)
         else:
-            logger.info(
-                f"Responding with 404 Not Found to request for {self.path} from {client_ip}"
-            )
+            logger.debug(f"Health check: 404 for {self.path} from {self.client_address[0]}")
             self.send_response(HTTPStatus.NOT_FOUND)
             self.end_headers()
 
@@ -58,179 +138,301 @@ class HealthCheckHandler(http.server.BaseHTTPRequestHandler):
         pass
 
 
+def set_cpu_affinity(env_var):
+    """Pin the calling thread to the comma-separated core list in env_var, if set.
+
+    Keeps the thread's caches warm instead of letting the scheduler migrate it.
+    Linux only; a no-op elsewhere or when the variable is unset.
+    Returns the cores the thread could run on before, or None if it was not pinned.
+    """
+    cores = os.getenv(env_var)
+    if not cores or not hasattr(os, "sched_setaffinity"):
+        return None
+    try:
+        previous = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, {int(core) for core in cores.split(",")})
+        logger.info(f"{env_var}: pinned to cores {sorted(os.sched_getaffinity(0))}")
+        return previous
+    except (ValueError, OSError) as e:
+        logger.warning(f"Ignoring invalid {env_var}={cores!r}: {e}")
+        return None
+
+
+def pin_event_loop(loop):
+    """Pin the event loop thread to WS_CPU_AFFINITY and keep helper threads off it.
+
+    Threads inherit the mask of the thread that starts them, so the default
+    executor (asyncio.to_thread) and the tool executor get the remaining cores.
+    """
+    previous = set_cpu_affinity("WS_CPU_AFFINITY")
+    if not previous:
+        return
+    helper_cores = (previous - os.sched_getaffinity(0)) or previous
+    loop.set_default_executor(
+        ThreadPoolExecutor(
+            thread_name_prefix="asyncio",
+            initializer=os.sched_setaffinity,
+            initargs=(0, helper_cores),
+        )
+    )
+    set_tool_thread_affinity(helper_cores)
+    logger.info(f"Helper threads run on cores {sorted(helper_cores)}")
+
+
+def serve_health_checks(httpd):
+    set_cpu_affinity("HEALTH_CPU_AFFINITY")
+    httpd.serve_forever()
+
+
 def start_health_check_server(health_host, health_port):
     try:
-        httpd = http.server.HTTPServer((health_host, health_port), HealthCheckHandler)
+        # One thread per probe, so a slow client cannot block the next probe
+        httpd = http.server.ThreadingHTTPServer((health_host, health_port), HealthCheckHandler)
+        httpd.daemon_threads = True
         httpd.timeout = 5
 
-        logger.info(f"Starting health check server on {health_host}:{health_port}")
-
-        thread = threading.Thread(target=httpd.serve_forever)
-        thread.daemon = (
-            True
-        )
+        thread = threading.Thread(target=serve_health_checks, args=(httpd,), daemon=True)
         thread.start()
 
         logger.info(
             f"Health check server started at http://{health_host}:{health_port}/health"
         )
-        logger.info(f"Health check thread is alive: {thread.is_alive()}")
-
-        try:
-            import urllib.request
-
-            with urllib.request.urlopen(
-                f"http://localhost:{health_port}/health", timeout=2
-            ) as response:
-                logger.info(
-                    f"Local health check test: {response.status} - {response.read().decode('utf-8')}"
-                )
-        except Exception as e:
-            logger.warning(f"Local health check test failed: {e}")
-
     except Exception as e:
         logger.error(f"Failed to start health check server: {e}", exc_info=True)
 
 
+def process_health_check(connection, request):
+    """Answer HTTP health probes on the websocket port without starting a session."""
+    if request.path == "/health":
+        response = connection.respond(HTTPStatus.OK, HEALTH_BODY)
+        del response.headers["Content-Type"]
+        response.headers["Content-Type"] = "application/json"
+        return response
+    return None
+
+
+class ClientConnection:
+    """Per-websocket state shared by the event handlers."""
+    __slots__ = ("websocket", "region", "stream_manager", "forward_task")
+
+    def __init__(self, websocket, region):
+        self.websocket = websocket
+        self.region = region
+        self.stream_manager = None
+        self.forward_task = None
+
+    def active_stream_manager(self):
+        if self.stream_manager and self.stream_manager.is_active:
+            return self.stream_manager
+        return None
+
+    async def close_session(self):
+        """Close the Bedrock session and stop forwarding its responses."""
+        if self.stream_manager:
+            await self.stream_manager.close()
+            self.stream_manager = None
+        if self.forward_task and not self.forward_task.done():
+            self.forward_task.cancel()
+            try:
+                await self.forward_task
+            except asyncio.CancelledError:
+                pass
+        self.forward_task = None
+
+
+async def forward_event(conn, data):
+    stream_manager = conn.active_stream_manager()
+    if stream_manager:
+        await stream_manager.send_raw_event(data)
+    else:
+        debug_print(f"Received event {next(iter(data['event']))} but no active stream manager")
+
+
+async def on_session_start(conn, data):
+    if conn.stream_manager:
+        # Reuse this connection's manager; only the Bedrock stream is reopened
+        await conn.stream_manager.reset()
+    else:
+        conn.stream_manager = S2sSessionManager(model_id='amazon.nova-2-sonic-v1:0', region=conn.region, mcp_client=MCP_CLIENT, strands_agent=STRANDS_AGENT)
+        await conn.stream_manager.initialize_stream()
+    if not conn.forward_task or conn.forward_task.done():
+        conn.forward_task = asyncio.create_task(forward_responses(conn.websocket, conn.stream_manager))
+    await forward_event(conn, data)
+
+
+async def on_session_end(conn, data):
+    # Keep the manager and its forward task for a following sessionStart
+    if conn.stream_manager:
+        await conn.stream_manager.close()
+
+
+async def on_prompt_start(conn, data):
+    stream_manager = conn.active_stream_manager()
+    if stream_manager:
+        stream_manager.prompt_name = data['event']['promptStart']['promptName']
+    await forward_event(conn, data)
+
+
+async def on_content_start(conn, data):
+    stream_manager = conn.active_stream_manager()
+    content_start = data['event']['contentStart']
+    if stream_manager and content_start.get('type') == 'AUDIO':
+        stream_manager.audio_content_name = content_start['contentName']
+    await forward_event(conn, data)
+
+
+async def on_audio_input(conn, audio_base64):
+    stream_manager = conn.active_stream_manager()
+    if not stream_manager:
+        debug_print("Received event audioInput but no active stream manager")
+    elif not stream_manager.prompt_name or not stream_manager.audio_content_name:
+        debug_print("Received audioInput before promptStart/contentStart, dropping it")
+    else:
+        # Names come from the session rather than being re-read from every frame
+        stream_manager.add_audio_chunk(stream_manager.prompt_name, stream_manager.audio_content_name, audio_base64)
+
+
+# Client events with special handling; everything else is forwarded to Bedrock as-is
+EVENT_HANDLERS = {
+    'sessionStart': on_session_start,
+    'sessionEnd': on_session_end,
+    'promptStart': on_prompt_start,
+    'contentStart': on_content_start,
+    'audioInput': on_audio_input,
+}
+
+
 async def websocket_handler(websocket):
     aws_region = os.getenv("AWS_DEFAULT_REGION")
     if not aws_region:
         aws_region = "us-east-1"
 
-    stream_manager = None
-    forward_task = None
+    conn = ClientConnection(websocket, aws_region)
     
     try:
         async for message in websocket:
             try:
-                data = json.loads(message)
-                if 'body' in data:
-                    data = json.loads(data["body"])
-                if 'event' in data:
-                    event_type = list(data['event'].keys())[0]
-                    
-                    if event_type == 'sessionStart':
-                        if stream_manager:
-                            await stream_manager.close()
-                        if forward_task and not forward_task.done():
-                            forward_task.cancel()
-                            try:
-                                await forward_task
-                            except asyncio.CancelledError:
-                                pass
-
-                        stream_manager = S2sSessionManager(model_id='amazon.nova-2-sonic-v1:0', region=aws_region, mcp_client=MCP_CLIENT, strands_agent=STRANDS_AGENT)
-                        
-                        await stream_manager.initialize_stream()
-                        
-                        forward_task = asyncio.create_task(forward_responses(websocket, stream_manager))
-
-                    elif event_type == 'sessionEnd':
-                        if stream_manager:
-                            await stream_manager.close()
-                            stream_manager = None
-                        if forward_task and not forward_task.done():
-                            forward_task.cancel()
-                            try:
-                                await forward_task
-                            except asyncio.CancelledError:
-                                pass
-                            forward_task = None
-
-                    if event_type == "audioInput":
-                        debug_print(message[0:180])
-                    else:
-                        debug_print(message)
-                    
-                    if stream_manager and stream_manager.is_active:
-                        if event_type == 'promptStart':
-                            stream_manager.prompt_name = data['event']['promptStart']['promptName']
-                        elif event_type == 'contentStart' and data['event']['contentStart'].get('type') == 'AUDIO':
-                            stream_manager.audio_content_name = data['event']['contentStart']['contentName']
-                        
-                        if event_type == 'audioInput':
-                            prompt_name = data['event']['audioInput']['promptName']
-                            content_name = data['event']['audioInput']['contentName']
-                            audio_base64 = data['event']['audioInput']['content']
-                            
-                            stream_manager.add_audio_chunk(prompt_name, content_name, audio_base64)
-                        else:
-                            await stream_manager.send_raw_event(data)
-                    elif event_type not in ['sessionStart', 'sessionEnd']:
-                        debug_print(f"Received event {event_type} but no active stream manager")
-                        
-            except json.JSONDecodeError:
-                print("Invalid JSON received from WebSocket")
+                # Only parse errors are reported as invalid JSON; handler errors fall through below
+                try:
+                    event_type, data = parse_client_message(message)
+                except ValueError:
+                    logger.error("Invalid JSON received from WebSocket")
+                    continue
+                if event_type:
+                    debug_print(message[0:180] if event_type == "audioInput" else message)
+                    await EVENT_HANDLERS.get(event_type, forward_event)(conn, data)
+
             except Exception as e:
-                print(f"Error processing WebSocket message: {e}")
-                if DEBUG:
-                    import traceback
-                    traceback.print_exc()
+                # Tracebacks are only formatted when DEBUG logging is enabled
+                logger.error("Error processing WebSocket message: %s", e,
+                             exc_info=logger.isEnabledFor(logging.DEBUG))
     except websockets.exceptions.ConnectionClosed:
-        print("WebSocket connection closed")
+        logger.info("WebSocket connection closed")
     finally:
-        if stream_manager:
-            await stream_manager.close()
-        if forward_task and not forward_task.done():
-            forward_task.cancel()
-            try:
-                await forward_task
-            except asyncio.CancelledError:
-                pass
+        await conn.close_session()
         if MCP_CLIENT:
             MCP_CLIENT.cleanup()
 
 
 async def forward_responses(websocket, stream_manager):
+    """Forward Bedrock responses to the client.
+
+    Responses already waiting in the queue are coalesced into one text frame
+    holding a JSON array (bounded by FORWARD_BATCH_MAX_EVENTS and
+    FORWARD_BATCH_MAX_BYTES); a lone response is sent as a plain object.
+    """
+    output_queue = stream_manager.output_queue
     try:
         while True:
-            response = await stream_manager.output_queue.get()
-            
+            response = await output_queue.get()
+            parts = [orjson.dumps(response)]
+            size = len(parts[0])
+            while len(parts) < FORWARD_BATCH_MAX_EVENTS and size < FORWARD_BATCH_MAX_BYTES:
+                try:
+                    response = output_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                parts.append(orjson.dumps(response))
+                size += len(parts[-1])
+
             try:
-                event = json.dumps(response)
-                await websocket.send(event)
+                event = parts[0] if len(parts) == 1 else b"[" + b",".join(parts) + b"]"
+                # Decode to str so the browser still receives a text frame
+                await websocket.send(event.decode("utf-8"))
             except websockets.exceptions.ConnectionClosed:
                 break
     except asyncio.CancelledError:
         pass
     except Exception as e:
-        print(f"Error forwarding responses: {e}")
-        websocket.close()
-        stream_manager.close()
+        logger.error("Error forwarding responses: %s", e)
+        await websocket.close()
+        await stream_manager.close()
 
 
-async def main(host, port, health_port, enable_mcp=False, enable_strands_agent=False):
+async def start_mcp_client():
+    global MCP_CLIENT
+    logger.info("MCP enabled")
+    try:
+        client = McpLocationClient()
+        await asyncio.wait_for(client.connect_to_server(), timeout=AGENT_STARTUP_TIMEOUT)
+        # Only publish the client once it is connected; sessions pick it up on sessionStart
+        MCP_CLIENT = client
+    except Exception as ex:
+        logger.error("Failed to start MCP client: %r", ex)
+
+
+async def start_strands_agent():
+    global STRANDS_AGENT
+    logger.info("Strands agent enabled")
+    try:
+        # The constructor blocks, so it runs off the event loop
+        STRANDS_AGENT = await asyncio.wait_for(asyncio.to_thread(StrandsAgent), timeout=AGENT_STARTUP_TIMEOUT)
+    except Exception as ex:
+        logger.error("Failed to start Strands agent: %r", ex)
+
 
+async def main(host, port, health_port, enable_mcp=False, enable_strands_agent=False):
+    # Started before pinning, so the health thread keeps the process affinity
     if health_port:
         try:
             start_health_check_server(host, health_port)
         except Exception as ex:
-            print("Failed to start health check endpoint",ex)
-    
-    if enable_mcp:
-        print("MCP enabled")
-        try:
-            global MCP_CLIENT
-            MCP_CLIENT = McpLocationClient()
-            await MCP_CLIENT.connect_to_server()
-        except Exception as ex:
-            print("Failed to start MCP client",ex)
-    
-    if enable_strands_agent:
-        print("Strands agent enabled")
-        try:
-            global STRANDS_AGENT
-            STRANDS_AGENT = StrandsAgent()
-        except Exception as ex:
-            print("Failed to start MCP client",ex)
+            logger.error("Failed to start health check endpoint: %s", ex)
+
+    pin_event_loop(asyncio.get_running_loop())
 
     try:
-        async with websockets.serve(websocket_handler, host, port):
-            print(f"WebSocket server started at host:{host}, port:{port}")
-            
-            await asyncio.Future()
+        async with websockets.serve(
+            websocket_handler, host, port,
+            process_request=process_health_check,
+            # base64 audio barely compresses, so per-message deflate only costs CPU
+            compression=None,
+            max_size=WS_MAX_MESSAGE_SIZE,
+            write_limit=WS_WRITE_LIMIT,
+        ):
+            logger.info("WebSocket server started at host:%s, port:%s", host, port)
+
+            # Agent integrations start in the background so the server answers probes right away
+            startup = []
+            if enable_mcp:
+                startup.append(start_mcp_client())
+            if enable_strands_agent:
+                startup.append(start_strands_agent())
+            agent_startup = asyncio.gather(*startup)
+
+            try:
+                await asyncio.Future()
+            finally:
+                # Stop integrations that are still starting and report any error they raised
+                agent_startup.cancel()
+                try:
+                    await agent_startup
+                except asyncio.CancelledError:
+                    pass
+                except Exception as ex:
+                    logger.error("Agent integration startup failed: %r", ex)
     except Exception as ex:
-        print("Failed to start websocket service",ex)
+        logger.error("Failed to start websocket service: %s", ex)
 
 if __name__ == "__main__":
     import argparse
@@ -253,19 +455,16 @@ if __name__ == "__main__":
     aws_secret = os.getenv("AWS_SECRET_ACCESS_KEY")
 
     if not host or not port:
-        print(f"HOST and PORT are required. Received HOST: {host}, PORT: {port}")
+        logger.error("HOST and PORT are required. Received HOST: %s, PORT: %s", host, port)
     elif not aws_key_id or not aws_secret:
-        print(f"AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY are required.")
+        logger.error("AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY are required.")
     else:
         try:
-            asyncio.run(main(host, port, health_port, enable_mcp, enable_strands))
+            asyncio.run(main(host, port, health_port, enable_mcp, enable_strands), loop_factory=LOOP_FACTORY)
         except KeyboardInterrupt:
-            print("Server stopped by user")
+            logger.info("Server stopped by user")
         except Exception as e:
-            print(f"Server error: {e}")
-            if args.debug:
-                import traceback
-                traceback.print_exc()
+            logger.error("Server error: %s", e, exc_info=args.debug)
         finally:
             if MCP_CLIENT:
                 MCP_CLIENT.cleanup()
\ No newline at end of file
@@ -406,7 +406,12 @@ class S2sChatBot extends React.Component {
             // Handle incoming messages
             this.socket.onmessage = (message) => {
                 const event = JSON.parse(message.data);
-                this.handleIncomingMessage(event);
+                // The server batches queued events into a JSON array
+                if (Array.isArray(event)) {
+                    event.forEach((e) => this.handleIncomingMessage(e));
+                } else {
+                    this.handleIncomingMessage(event);
+                }
             };
 
             // Handle errors
@@ -56,6 +56,10 @@ async def get_user_preferences(
     await asyncio.sleep(20)
     return {"preferences": "I like to read books and watch movies."}
 
+def prewarm(proc: agents.JobProcess):
+    """Load the Silero VAD once per process; jobs share it and open their own streams."""
+    proc.userdata["vad"] = silero.VAD.load()
+
 async def entrypoint(ctx: agents.JobContext):
     await ctx.connect(auto_subscribe=AutoSubscribe.AUDIO_ONLY)
     chat_ctx = ChatContext.empty()
@@ -68,7 +72,7 @@ async def entrypoint(ctx: agents.JobContext):
     realtime_model = RealtimeModel(voice="matthew")
     realtime_model.model_id = "amazon.nova-2-sonic-v1:0"
     session = AgentSession(
-        vad=silero.VAD.load(),
+        vad=ctx.proc.userdata["vad"],
         llm=realtime_model
         )
     
@@ -81,6 +85,7 @@ if __name__ == "__main__":
     agents.cli.run_app(
         agents.WorkerOptions(
             entrypoint_fnc=entrypoint,
+            prewarm_fnc=prewarm,
             job_executor_type=JobExecutorType.THREAD,
             # Avoid clashes with other demos using 8081.
             port=int(os.getenv("LIVEKIT_AGENT_PORT", "0")),
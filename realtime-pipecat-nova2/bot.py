@@ -1,16 +1,21 @@
 import asyncio
+import functools
 import os
 import random
 from datetime import datetime
+from importlib import resources
 from typing import Optional
 
+import onnxruntime
 from dotenv import load_dotenv
 from loguru import logger
+from transformers import WhisperFeatureExtractor
 
 from pipecat.adapters.schemas.function_schema import FunctionSchema
 from pipecat.adapters.schemas.tools_schema import ToolsSchema
+from pipecat.audio.turn.smart_turn.base_smart_turn import BaseSmartTurn
 from pipecat.audio.turn.smart_turn.local_smart_turn_v3 import LocalSmartTurnAnalyzerV3
-from pipecat.audio.vad.silero import SileroVADAnalyzer
+from pipecat.audio.vad.silero import SileroOnnxModel, SileroVADAnalyzer
 from pipecat.frames.frames import LLMRunFrame
 from pipecat.pipeline.runner import PipelineRunner
 from pipecat.processors.aggregators.llm_context import LLMContext
@@ -32,7 +37,8 @@ from pipecat.turns.user_start import MinWordsUserTurnStartStrategy
 from pipecat.turns.user_stop import SpeechTimeoutUserTurnStopStrategy, TurnAnalyzerUserTurnStopStrategy
 from pipecat.turns.user_turn_strategies import UserTurnStrategies
 from pipecat.processors.aggregators.llm_response_universal import LLMUserAggregatorParams
-from pipecat.audio.vad.vad_analyzer import VADParams
+from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADParams
+from pipecat.utils.env import env_truthy
 
 # Keep values from current environment and use .env only as fallback.
 load_dotenv(override=False)
@@ -76,11 +82,98 @@ weather_function = FunctionSchema(
 tools = ToolsSchema(standard_tools=[weather_function])
 
 
+# Optional SmartTurn ONNX model to load instead of the bundled one (e.g. a re-quantized export)
+SMART_TURN_MODEL_PATH = os.getenv("SMART_TURN_MODEL_PATH")
+
+SILERO_MODEL = resources.files("pipecat.audio.vad.data").joinpath("silero_vad.onnx")
+SMART_TURN_MODEL = resources.files("pipecat.audio.turn.smart_turn.data").joinpath("smart-turn-v3.2-cpu.onnx")
+
+
+def create_onnx_session(model_path: str) -> onnxruntime.InferenceSession:
+    """Open a CPU ONNX Runtime session that runs each inference on the calling thread only.
+
+    A single intra-op thread keeps the audio models from competing with the
+    event loop for cores. run() is thread-safe, so one session serves every
+    connection.
+    """
+    options = onnxruntime.SessionOptions()
+    options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+    options.inter_op_num_threads = 1
+    options.intra_op_num_threads = 1
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return onnxruntime.InferenceSession(
+        str(model_path), sess_options=options, providers=["CPUExecutionProvider"]
+    )
+
+
+@functools.cache
+def silero_session() -> onnxruntime.InferenceSession:
+    return create_onnx_session(SILERO_MODEL)
+
+
+@functools.cache
+def smart_turn_session() -> onnxruntime.InferenceSession:
+    """SmartTurn session, using SMART_TURN_MODEL_PATH when it is set."""
+    if SMART_TURN_MODEL_PATH:
+        try:
+            return create_onnx_session(SMART_TURN_MODEL_PATH)
+        except Exception as e:
+            logger.warning(f"Failed to load SmartTurn model {SMART_TURN_MODEL_PATH}, using the bundled model: {e}")
+    return create_onnx_session(SMART_TURN_MODEL)
+
+
+@functools.cache
+def smart_turn_feature_extractor() -> WhisperFeatureExtractor:
+    return WhisperFeatureExtractor(chunk_length=8)
+
+
+class SharedSileroModel(SileroOnnxModel):
+    """Silero model state for one audio stream, running on the shared session."""
+
+    def __init__(self):
+        self.session = silero_session()
+        self.reset_states()
+        self.sample_rates = [8000, 16000]
+
+
+class SharedSileroVADAnalyzer(SileroVADAnalyzer):
+    """SileroVADAnalyzer that keeps its own stream state but not its own ONNX session."""
+
+    def __init__(self, *, sample_rate: Optional[int] = None, params: Optional[VADParams] = None):
+        # Skip SileroVADAnalyzer.__init__, which loads a new session from disk
+        VADAnalyzer.__init__(self, sample_rate=sample_rate, params=params)
+        self._model = SharedSileroModel()
+        self._last_reset_time = 0
+
+
+class SharedSmartTurnAnalyzer(LocalSmartTurnAnalyzerV3):
+    """LocalSmartTurnAnalyzerV3 that keeps its own turn state but not its own ONNX session."""
+
+    def __init__(self, **kwargs):
+        # Skip LocalSmartTurnAnalyzerV3.__init__, which loads a new session from disk
+        BaseSmartTurn.__init__(self, **kwargs)
+        self._log_data = env_truthy("PIPECAT_SMART_TURN_LOG_DATA", default=False)
+        self._feature_extractor = smart_turn_feature_extractor()
+        self._session = smart_turn_session()
+
+
+def preload_audio_models() -> None:
+    """Load the Silero VAD and SmartTurn models once at server start.
+
+    Every connection builds its own analyzers, since they hold per-stream
+    state, but they all run on these shared ONNX sessions.
+    """
+    silero_session()
+    smart_turn_session()
+    smart_turn_feature_extractor()
+    logger.info("Audio analyzer models preloaded")
+
+
 transport_params = {
     "twilio": lambda: FastAPIWebsocketParams(
         audio_in_enabled=True,
         audio_out_enabled=True,
-        vad_analyzer=SileroVADAnalyzer(),
+        vad_analyzer=SharedSileroVADAnalyzer(),
     )
 }
 
@@ -129,10 +222,10 @@ async def run_bot(
         user_params=LLMUserAggregatorParams(
             user_turn_strategies=UserTurnStrategies(
                 stop=[TurnAnalyzerUserTurnStopStrategy(
-                    turn_analyzer=LocalSmartTurnAnalyzerV3()
+                    turn_analyzer=SharedSmartTurnAnalyzer()
                 )]
             ),
-            vad_analyzer=SileroVADAnalyzer(),
+            vad_analyzer=SharedSileroVADAnalyzer(),
         ),
     )
     # vad_analyzer = SileroVADAnalyzer(
@@ -1,4 +1,7 @@
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from typing import Any, Dict
 
 from fastapi.middleware.cors import CORSMiddleware
@@ -19,7 +22,55 @@ from server_utils import (
 load_dotenv(override=False)
 
 
-app = FastAPI()
+def set_cpu_affinity(env_var: str) -> set[int] | None:
+    """Pin the calling thread to the comma-separated core list in env_var, if set (Linux only).
+
+    Returns the cores the thread could run on before, or None if it was not pinned.
+    """
+    cores = os.getenv(env_var)
+    if not cores or not hasattr(os, "sched_setaffinity"):
+        return None
+    try:
+        previous = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, {int(core) for core in cores.split(",")})
+        logger.info(f"{env_var}: pinned to cores {sorted(os.sched_getaffinity(0))}")
+        return previous
+    except (ValueError, OSError) as e:
+        logger.warning(f"Ignoring invalid {env_var}={cores!r}: {e}")
+        return None
+
+
+def pin_event_loop(loop: asyncio.AbstractEventLoop) -> None:
+    """Pin the event loop thread to WS_CPU_AFFINITY and keep executor threads off it.
+
+    Threads inherit the mask of the thread that starts them, so the default
+    executor (asyncio.to_thread, run_in_executor) gets the remaining cores.
+    """
+    previous = set_cpu_affinity("WS_CPU_AFFINITY")
+    if not previous:
+        return
+    helper_cores = (previous - os.sched_getaffinity(0)) or previous
+    loop.set_default_executor(
+        ThreadPoolExecutor(
+            thread_name_prefix="asyncio",
+            initializer=os.sched_setaffinity,
+            initargs=(0, helper_cores),
+        )
+    )
+    logger.info(f"Executor threads run on cores {sorted(helper_cores)}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs on the uvicorn worker's event loop thread
+    pin_event_loop(asyncio.get_running_loop())
+    from bot import preload_audio_models
+
+    preload_audio_models()
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -89,4 +140,6 @@ async def websocket_endpoint(websocket: WebSocket):
 if __name__ == "__main__":
     port = int(os.getenv("PORT", "7860"))
     logger.info(f"Starting Twilio outbound chatbot server on port {port}")
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # loop="auto" selects uvloop when it is installed (not on Windows)
+    # ws_max_size bounds a single incoming websocket message (1 MiB, uvicorn's default is 16 MiB)
+    uvicorn.run(app, host="0.0.0.0", port=port, loop="auto", ws_max_size=2**20)
@@ -1,10 +1,11 @@
+import functools
 import os
+from xml.sax.saxutils import escape
 
 from fastapi import HTTPException, Request
 from loguru import logger
 from pydantic import BaseModel
 from twilio.rest import Client as TwilioClient
-from twilio.twiml.voice_response import Connect, Stream, VoiceResponse
 
 
 class DialoutRequest(BaseModel):
@@ -39,6 +40,12 @@ async def dialout_request_from_request(request: Request) -> DialoutRequest:
         raise HTTPException(status_code=400, detail=f"Invalid request data: {str(e)}")
 
 
+@functools.lru_cache(maxsize=1)
+def get_twilio_client(account_sid: str, auth_token: str) -> TwilioClient:
+    """Return a shared Twilio client so its HTTP session is reused across calls."""
+    return TwilioClient(account_sid, auth_token)
+
+
 async def make_twilio_call(dialout_request: DialoutRequest) -> TwilioCallResult:
     to_number = dialout_request.to_number
     from_number = dialout_request.from_number
@@ -54,7 +61,7 @@ async def make_twilio_call(dialout_request: DialoutRequest) -> TwilioCallResult:
     if not account_sid or not auth_token:
         raise ValueError("Missing Twilio credentials")
 
-    client = TwilioClient(account_sid, auth_token)
+    client = get_twilio_client(account_sid, auth_token)
     call = client.calls.create(to=to_number, from_=from_number, url=twiml_url, method="POST")
 
     return TwilioCallResult(call_sid=call.sid, to_number=to_number)
@@ -82,25 +89,39 @@ def get_websocket_url() -> str:
         return ws_url
 
 
+# TwiML for streaming a call to the bot, equivalent to what twilio's VoiceResponse renders
+TWIML_TEMPLATE = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Response><Connect><Stream url="{url}">{parameters}</Stream></Connect>'
+    '<Pause length="20" /></Response>'
+)
+TWIML_PARAMETER_TEMPLATE = '<Parameter name="{name}" value="{value}" />'
+XML_ATTR_ENTITIES = {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#9;"}
+
+
+@functools.lru_cache(maxsize=1024)
+def render_twiml(websocket_url: str, to_number: str, from_number: str, service_host: str | None) -> str:
+    """Render the stream TwiML once per distinct (url, to, from, service host)."""
+    parameters = [("to_number", to_number), ("from_number", from_number)]
+    if service_host is not None:
+        parameters.append(("_pipecatCloudServiceHost", service_host))
+    return TWIML_TEMPLATE.format(
+        url=escape(websocket_url, XML_ATTR_ENTITIES),
+        parameters="".join(
+            TWIML_PARAMETER_TEMPLATE.format(name=name, value=escape(value, XML_ATTR_ENTITIES))
+            for name, value in parameters
+        ),
+    )
+
+
 def generate_twiml(twiml_request: TwimlRequest) -> str:
     websocket_url = get_websocket_url()
     logger.debug(f"Generating TwiML with WebSocket URL: {websocket_url}")
 
-    response = VoiceResponse()
-    connect = Connect()
-    stream = Stream(url=websocket_url)
-    
-    stream.parameter(name="to_number", value=twiml_request.to_number)
-    stream.parameter(name="from_number", value=twiml_request.from_number)
-
+    service_host = None
     if os.getenv("ENV") == "production":
         agent_name = os.getenv("AGENT_NAME")
         org_name = os.getenv("ORGANIZATION_NAME")
         service_host = f"{agent_name}.{org_name}"
-        stream.parameter(name="_pipecatCloudServiceHost", value=service_host)
-
-    connect.append(stream)
-    response.append(connect)
-    response.pause(length=20)
 
-    return str(response)
+    return render_twiml(websocket_url, twiml_request.to_number, twiml_request.from_number, service_host)
@@ -1,11 +1,45 @@
 from dotenv import load_dotenv
 load_dotenv()
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 import routes
+from assemblyai_speech_to_speech.langchain_assemblyai import close_http_client
+from database import init_database, run_maintenance
+
+logger = logging.getLogger(__name__)
+
+# Seconds between SQLite WAL checkpoints / planner statistics refreshes
+DB_MAINTENANCE_INTERVAL = 15 * 60
+
+
+async def db_maintenance_loop():
+    """Run database maintenance periodically, off the event loop."""
+    while True:
+        await asyncio.sleep(DB_MAINTENANCE_INTERVAL)
+        try:
+            await asyncio.to_thread(run_maintenance)
+        except Exception as e:
+            logger.error(f"Database maintenance failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create missing tables and indices, migrate plaintext API keys and warm the
+    # connection pool before serving; safe to run on every start
+    await asyncio.to_thread(init_database)
+    maintenance_task = asyncio.create_task(db_maintenance_loop())
+    yield
+    maintenance_task.cancel()
+    # Release pooled connections held by shared HTTP clients
+    await close_http_client()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -1,13 +1,16 @@
 import asyncio
+import functools
 import json
-import base64
+import orjson
+import math
+import struct
 import websockets
 import httpx
 import numpy as np
+from binascii import a2b_base64
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, AsyncIterator, Any, Callable, Coroutine, Optional
+from typing import AsyncGenerator, AsyncIterator, Any, Callable, ClassVar, Coroutine, Optional
 
-from .utils import amerge
 from langchain_core.tools import BaseTool
 from langchain_core._api import beta
 from langchain_core.utils import secret_from_env
@@ -34,7 +37,7 @@ except ImportError:
 # Import audio processing utilities
 try:
     from utils.audio_processing import (
-        process_audio_with_spectral_gating,
+        reduce_noise_pcm,
         should_process_audio_event,
         reduce_gain_pcm,
     )
@@ -55,57 +58,118 @@ DEFAULT_URL = "wss://aaigentsv1.up.railway.app/ws"
 # AssemblyAI REST API URL
 REST_API_URL = "https://aaigentsv1.up.railway.app"
 
+# Shared HTTP client for the REST API, created on first use so connections are reused
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient for the AssemblyAI REST API."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=32),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared REST API client (called on application shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 EVENTS_TO_IGNORE = {
     "rate_limits.updated",
     "session.created",
     "session.updated",
 }
 
+# Binary audio frames sent to the client: [u32 LE header length][JSON header][PCM16 audio]
+AUDIO_DELTA_HEADER = b'{"type":"response.audio.delta"}'
+AUDIO_DELTA_FRAME_PREFIX = struct.pack("<I", len(AUDIO_DELTA_HEADER)) + AUDIO_DELTA_HEADER
+
+# Outgoing audio chunks are coalesced up to this many bytes or this many seconds
+AUDIO_BATCH_MAX_BYTES = 8 * 1024
+AUDIO_BATCH_MAX_DELAY = 0.02
+
 # Audio configuration
 ASSEMBLYAI_SAMPLE_RATE = 16000  # Default AssemblyAI audio sample rate
 TARGET_SAMPLE_RATE = 24000  # Target sample rate for client
 
 
-def resample_audio(audio_bytes: bytes, from_rate: int, to_rate: int) -> bytes:
+# Half-length of the polyphase anti-aliasing filter, in units of the larger rate factor
+RESAMPLE_FILTER_HALF_LEN = 10
+
+
+@functools.lru_cache(maxsize=8)
+def _resample_filter(up: int, down: int) -> np.ndarray:
+    """Design the polyphase low-pass FIR for an up/down ratio (once per ratio).
+
+    Stored as float32 so resample_poly filters int16 input in float32 rather
+    than promoting the whole frame to float64.
+    """
+    max_rate = max(up, down)
+    half_len = RESAMPLE_FILTER_HALF_LEN * max_rate
+    return signal.firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0)).astype(np.float32)
+
+
+def resample_audio(
+    audio_bytes: bytes,
+    from_rate: int,
+    to_rate: int,
+    out: Optional[bytearray] = None,
+) -> bytes | bytearray | memoryview:
     """
     Resample audio from one sample rate to another.
     
+    Uses polyphase FIR resampling (scipy.signal.resample_poly) with a filter
+    designed once per rate ratio, working directly in the int16 sample range.
+    
+    The result is written straight into a byte buffer (no trailing tobytes()
+    copy). Pass a reusable `out` bytearray to avoid allocating one per call;
+    the returned memoryview is then only valid until `out` is reused.
+    
     Args:
         audio_bytes: Raw PCM16 audio bytes (little-endian, mono)
         from_rate: Source sample rate
         to_rate: Target sample rate
+        out: Optional reusable output buffer, used when it is large enough
     
     Returns:
-        Resampled audio bytes (PCM16, little-endian, mono)
+        Resampled audio (PCM16, little-endian, mono): a memoryview into `out`,
+        a new bytearray, or the input unchanged if no resampling was done
     """
+    if from_rate == to_rate:
+        return audio_bytes
+    
     if not SCIPY_AVAILABLE:
         print("Warning: scipy not available, returning original audio without resampling")
         return audio_bytes
     
     try:
-        # Convert bytes to numpy array (int16, little-endian)
+        # Zero-copy int16 view of the input (little-endian)
         audio_array = np.frombuffer(audio_bytes, dtype=np.int16)
         
-        # Convert to float32 for processing (normalize to [-1, 1])
-        audio_float = audio_array.astype(np.float32) / 32768.0
-        
-        # Calculate the number of samples after resampling
-        num_samples = len(audio_float)
-        target_samples = int(num_samples * to_rate / from_rate)
+        # Reduce the rate ratio, e.g. 16 kHz -> 24 kHz is up=3, down=2
+        ratio = math.gcd(from_rate, to_rate)
+        up, down = to_rate // ratio, from_rate // ratio
         
-        # Resample using scipy.signal.resample
-        resampled_float = signal.resample(audio_float, target_samples)
+        # Writable int16 view over the output buffer
+        target_samples = -(-len(audio_array) * up // down)
+        target_bytes = target_samples * 2
+        buffer = out if out is not None and len(out) >= target_bytes else bytearray(target_bytes)
+        resampled_int16 = np.frombuffer(buffer, dtype=np.int16, count=target_samples)
         
-        # Ensure values are in valid range [-1, 1]
-        resampled_float = np.clip(resampled_float, -1.0, 1.0)
+        resampled = signal.resample_poly(audio_array, up, down, window=_resample_filter(up, down))
         
-        # Convert back to int16
-        resampled_int16 = (resampled_float * 32768.0).astype(np.int16)
+        # Saturate to the int16 range in place, then convert into the output buffer
+        np.clip(resampled, -32768, 32767, out=resampled)
+        resampled_int16[:] = resampled
         
-        # Convert back to bytes (little-endian)
-        resampled_bytes = resampled_int16.tobytes()
-        
-        return resampled_bytes
+        return memoryview(buffer)[:target_bytes] if buffer is out else buffer
     
     except Exception as e:
         print(f"Error resampling audio: {e}, returning original audio")
@@ -139,7 +203,12 @@ async def connect(*, api_key: str, agent_id: str, url: str) -> AsyncGenerator[
         headers["Authorization"] = api_key
     
     websocket = await websockets.connect(
-        ws_url
+        ws_url,
+        # Raw PCM barely compresses; per-message deflate would only cost CPU
+        compression=None,
+        # Trusted upstream; skip the per-message size check
+        max_size=None,
+        write_limit=2**20,
     )
 
     try:
@@ -148,9 +217,8 @@ async def connect(*, api_key: str, agent_id: str, url: str) -> AsyncGenerator[
                 # Binary audio data
                 await websocket.send(event)
             elif isinstance(event, dict):
-                # JSON event
-                formatted_event = json.dumps(event)
-                await websocket.send(formatted_event)
+                # JSON event, serialized to UTF-8 bytes and sent as a text frame
+                await websocket.send(orjson.dumps(event), text=True)
             else:
                 # String event
                 await websocket.send(event)
@@ -171,8 +239,8 @@ async def connect(*, api_key: str, agent_id: str, url: str) -> AsyncGenerator[
                     print("EVENT: message", message)
                     # JSON event
                     try:
-                        yield json.loads(message)
-                    except json.JSONDecodeError:
+                        yield orjson.loads(message)
+                    except orjson.JSONDecodeError:
                         print(f"Error decoding message: {message}")
                         continue
 
@@ -183,26 +251,105 @@ async def connect(*, api_key: str, agent_id: str, url: str) -> AsyncGenerator[
         await websocket.close()
 
 
+class AudioFrameBatcher:
+    """
+    Coalesces consecutive PCM16 chunks into one binary audio frame.
+    
+    Chunks are flushed as a single AUDIO_DELTA_FRAME_PREFIX + PCM frame once
+    AUDIO_BATCH_MAX_BYTES are buffered or AUDIO_BATCH_MAX_DELAY seconds after
+    the first buffered chunk, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[bytes], Coroutine[Any, Any, None]],
+        max_bytes: int = AUDIO_BATCH_MAX_BYTES,
+        max_delay: float = AUDIO_BATCH_MAX_DELAY,
+    ) -> None:
+        self._send = send
+        self._max_bytes = max_bytes
+        self._max_delay = max_delay
+        self._buffer = bytearray(AUDIO_DELTA_FRAME_PREFIX)
+        self._timer: asyncio.TimerHandle | None = None
+        # Timer-driven flushes, referenced until they finish
+        self._flush_tasks: set[asyncio.Task] = set()
+        # Keeps frames in order when a timer flush and an explicit flush overlap
+        self._send_lock = asyncio.Lock()
+
+    async def push(self, audio: bytes) -> None:
+        self._buffer += audio
+        if len(self._buffer) - len(AUDIO_DELTA_FRAME_PREFIX) >= self._max_bytes:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._max_delay, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        task = asyncio.create_task(self._send_buffered())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._on_flush_done)
+
+    def _on_flush_done(self, task: asyncio.Task) -> None:
+        self._flush_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Error sending batched audio: {task.exception()}")
+
+    async def flush(self) -> None:
+        """Send any buffered audio now."""
+        self.cancel_timer()
+        await self._send_buffered()
+
+    async def _send_buffered(self) -> None:
+        async with self._send_lock:
+            if len(self._buffer) == len(AUDIO_DELTA_FRAME_PREFIX):
+                return
+            frame = bytes(self._buffer)
+            del self._buffer[len(AUDIO_DELTA_FRAME_PREFIX):]
+            await self._send(frame)
+
+    def cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    async def close(self) -> None:
+        """Stop the timer and cancel any timer flush still in flight."""
+        self.cancel_timer()
+        for task in self._flush_tasks:
+            task.cancel()
+        await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+
+
 class VoiceToolExecutor(BaseModel):
     """
     Can accept function calls and emits function call outputs to a stream.
     """
 
     tools_by_name: dict[str, BaseTool]
-    _trigger_future: asyncio.Future = PrivateAttr(default_factory=asyncio.Future)
-    _lock: asyncio.Lock = PrivateAttr(default_factory=asyncio.Lock)
-
-    async def _trigger_func(self) -> dict:  # returns a tool call
-        return await self._trigger_future
+    # Finished tool tasks, in completion order
+    _completed: asyncio.Queue = PrivateAttr(default_factory=asyncio.Queue)
+    # Running tool tasks, referenced until they finish
+    _running: set = PrivateAttr(default_factory=set)
 
     async def add_tool_call(self, tool_call: dict) -> None:
-        # lock to avoid simultaneous tool calls racing
-        async with self._lock:
-            if self._trigger_future.done():
-                # TODO: handle simultaneous tool calls better
-                raise ValueError("Tool call adding already in progress")
+        try:
+            task = await self._create_tool_call_task(tool_call)
+        except ValueError as e:
+            # immediately yield error, do not add task
+            self._completed.put_nowait({
+                "type": "tool.result",
+                "tool_call_id": tool_call.get("tool_call_id", tool_call.get("id")),
+                "result": f"Error: {str(e)}",
+            })
+            return
 
-            self._trigger_future.set_result(tool_call)
+        self._running.add(task)
+        task.add_done_callback(self._on_tool_done)
+
+    def _on_tool_done(self, task: asyncio.Task) -> None:
+        self._running.discard(task)
+        if not task.cancelled():
+            self._completed.put_nowait(task)
 
     async def _create_tool_call_task(self, tool_call: dict) -> asyncio.Task[dict]:
         tool = self.tools_by_name.get(tool_call["name"])
@@ -240,29 +387,56 @@ class VoiceToolExecutor(BaseModel):
         return task
 
     async def output_iterator(self) -> AsyncIterator[dict]:  # yield events
-        trigger_task = asyncio.create_task(self._trigger_func())
-        tasks = set([trigger_task])
         while True:
-            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
-            for task in done:
-                tasks.remove(task)
-                if task == trigger_task:
-                    async with self._lock:
-                        self._trigger_future = asyncio.Future()
-                    trigger_task = asyncio.create_task(self._trigger_func())
-                    tasks.add(trigger_task)
-                    tool_call = task.result()
-                    try:
-                        new_task = await self._create_tool_call_task(tool_call)
-                        tasks.add(new_task)
-                    except ValueError as e:
-                        yield {
-                            "type": "tool.result",
-                            "tool_call_id": tool_call.get("tool_call_id", tool_call.get("id")),
-                            "result": f"Error: {str(e)}",
-                        }
-                else:
-                    yield task.result()
+            completed = await self._completed.get()
+            # Error results are queued as dicts; finished tool tasks re-raise their errors here
+            yield completed if isinstance(completed, dict) else completed.result()
+
+
+def _json_schema(schema: Any) -> dict:
+    """JSON schema of a tool's args schema, which may be a pydantic v1/v2 model or a dict."""
+    if isinstance(schema, dict):
+        return schema
+    if hasattr(schema, "model_json_schema"):
+        return schema.model_json_schema()
+    return schema.schema()
+
+
+def build_tool_def(tool: BaseTool) -> dict:
+    """Convert a LangChain tool to the AssemblyAI tool definition format."""
+    # Reflect the args schema once; it provides both properties and required fields
+    try:
+        if hasattr(tool, 'args_schema') and tool.args_schema:
+            tool_schema = _json_schema(tool.args_schema)
+        else:
+            input_schema = tool.get_input_schema()
+            tool_schema = _json_schema(input_schema) if input_schema else {}
+    except Exception:
+        tool_schema = {}
+
+    # Get tool properties - use tool.args if available (like OpenAI implementation)
+    # Otherwise fall back to the args schema
+    if hasattr(tool, 'args') and tool.args:
+        properties = tool.args
+    else:
+        properties = tool_schema.get("properties", {})
+
+    # Convert to AssemblyAI tool format
+    # According to docs: Tool Definition Schema requires:
+    # - type: "function"
+    # - name: string
+    # - description: string
+    # - parameters: object with type, properties, and required fields
+    return {
+        "type": "function",
+        "name": tool.name,
+        "description": tool.description or "",
+        "parameters": {
+            "type": "object",
+            "properties": properties,
+            "required": tool_schema.get("required") or [],  # Ensure required is always a list
+        },
+    }
 
 
 class AssemblyAIVoiceReactAgent(BaseModel):
@@ -278,81 +452,62 @@ class AssemblyAIVoiceReactAgent(BaseModel):
     voice: str = Field(default=DEFAULT_VOICE)
     llm: str = Field(default="gpt-4o-mini")
 
+    # Agent ids already created/updated by this process, keyed by _agent_cache_key()
+    _agent_id_cache: ClassVar[dict[tuple, str]] = {}
+
+    # AssemblyAI tool definitions, built once from the tools at construction
+    _tool_defs: list[dict] = PrivateAttr(default_factory=list)
+    # (_agent_cache_key(), serialized agent_config) from the last create/update
+    _agent_config_cache: Optional[tuple[tuple, bytes]] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._tool_defs = [build_tool_def(tool) for tool in self.tools or []]
+
     async def _list_agents(self) -> list[dict]:
         """List all agents for the authenticated user."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{REST_API_URL}/agents",
-                headers={
-                    "Authorization": self.api_key.get_secret_value(),
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
-            # Handle both direct array response and nested "agents" field
-            if isinstance(data, list):
-                return data
-            return data.get("agents", [])
+        response = await get_http_client().get(
+            f"{REST_API_URL}/agents",
+            headers={
+                "Authorization": self.api_key.get_secret_value(),
+            },
+        )
+        response.raise_for_status()
+        data = response.json()
+        # Handle both direct array response and nested "agents" field
+        if isinstance(data, list):
+            return data
+        return data.get("agents", [])
 
     async def _get_agent_by_name(self, name: str) -> Optional[dict]:
         """Get an agent by name from the list of agents."""
         agents = await self._list_agents()
         for agent in agents:
-            if agent == name:
-                return agent
+            if isinstance(agent, dict):
+                if agent.get("name") == name or agent.get("agent_name") == name:
+                    return agent
+            elif agent == name:
+                return {"agent_name": agent}
         return None
 
     async def _create_or_update_agent(self) -> dict:
         """Create a new agent with the configured instructions and tools."""
-        # Convert tools to AssemblyAI format
-        tool_defs = []
-        if self.tools:
-            for tool in self.tools:
-                # Get tool properties - use tool.args if available (like OpenAI implementation)
-                # Otherwise try to get from args_schema
-                if hasattr(tool, 'args') and tool.args:
-                    properties = tool.args
-                elif hasattr(tool, 'args_schema') and tool.args_schema:
-                    tool_schema = tool.args_schema.schema()
-                    properties = tool_schema.get("properties", {})
-                else:
-                    # Fallback: try to get input schema
-                    try:
-                        input_schema = tool.get_input_schema()
-                        properties = input_schema.schema().get("properties", {}) if input_schema else {}
-                    except:
-                        properties = {}
-                
-                # Get required fields
-                required = []
-                if hasattr(tool, 'args_schema') and tool.args_schema:
-                    tool_schema = tool.args_schema.schema()
-                    required = tool_schema.get("required", [])
-                else:
-                    try:
-                        input_schema = tool.get_input_schema()
-                        if input_schema:
-                            required = input_schema.schema().get("required", [])
-                    except:
-                        pass
-                
-                # Convert to AssemblyAI tool format
-                # According to docs: Tool Definition Schema requires:
-                # - type: "function"
-                # - name: string
-                # - description: string
-                # - parameters: object with type, properties, and required fields
-                tool_def = {
-                    "type": "function",
-                    "name": tool.name,
-                    "description": tool.description or "",
-                    "parameters": {
-                        "type": "object",
-                        "properties": properties,
-                        "required": required if required else [],  # Ensure required is always a list
-                    },
-                }
-                tool_defs.append(tool_def)
+        response = await get_http_client().post(
+            f"{REST_API_URL}/agents",
+            headers={
+                "Authorization": self.api_key.get_secret_value(),
+                "Content-Type": "application/json",
+            },
+            content=self._agent_config_body(),
+        )
+        #print("response", response.json())
+        response.raise_for_status()
+        return response.json()
+
+    def _agent_config_body(self) -> bytes:
+        """Serialized agent configuration, rebuilt only when the configuration changes."""
+        cache_key = self._agent_cache_key()
+        if self._agent_config_cache is not None and self._agent_config_cache[0] == cache_key:
+            return self._agent_config_cache[1]
 
         # According to AssemblyAI docs, agent creation payload should include:
         # - name (required): Agent name/identifier
@@ -364,32 +519,19 @@ class AssemblyAIVoiceReactAgent(BaseModel):
         # Additional optional fields may include:
         # - audio_in_sample_rate, audio_out_sample_rate, temperature, etc.
         agent_config = {
-            "agent_name": "Petvisor_Voice_Agent",
+            "agent_name": self.agent_name,
             "instructions": self.instructions,
             "voice": self.voice,
             "language": "en",
             "audio_in_sample_rate": 24000,
             "audio_out_sample_rate": 24000,
-            "tools": tool_defs,
+            "tools": self._tool_defs,
         }
-        
-        # Add tools if provided
-        #if tool_defs:
-        #    agent_config["tools"] = tool_defs
-
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{REST_API_URL}/agents",
-                headers={
-                    "Authorization": self.api_key.get_secret_value(),
-                    "Content-Type": "application/json",
-                },
-                json=agent_config,
-            )
-            #print("agent_config", agent_config)
-            #print("response", response.json())
-            response.raise_for_status()
-            return response.json()
+        #print("agent_config", agent_config)
+
+        body = orjson.dumps(agent_config)
+        self._agent_config_cache = (cache_key, body)
+        return body
 
     async def _ensure_agent(self) -> str:
         """Ensure an agent exists, creating one if necessary. Update the configuration. Returns agent_id."""
@@ -397,13 +539,17 @@ class AssemblyAIVoiceReactAgent(BaseModel):
         if self.agent_id:
             return self.agent_id
         
+        # Reuse the agent this process already configured with the same settings
+        cache_key = self._agent_cache_key()
+        cached_agent_id = self._agent_id_cache.get(cache_key)
+        if cached_agent_id:
+            return cached_agent_id
+        
         # Check if agent exists by name
         agent_exists = False
         existing_agent = await self._get_agent_by_name(self.agent_name)
         if existing_agent:
-            agent_id = existing_agent
-            if agent_id:
-                agent_exists = True
+            agent_exists = True
         
         # Create new agent/update existing agent
         if not agent_exists:
@@ -421,187 +567,161 @@ class AssemblyAIVoiceReactAgent(BaseModel):
             print(f"Created agent: {self.agent_name} (ID: {agent_id})")
         else:
             print(f"Updated agent: {self.agent_name} (ID: {agent_id})")
+        self._agent_id_cache[cache_key] = agent_id
         return agent_id
 
+    def _agent_cache_key(self) -> tuple:
+        """Key for the agent id cache; changes whenever the pushed configuration would."""
+        tool_names = tuple(tool.name for tool in (self.tools or []))
+        return (self.agent_name, self.instructions, self.voice, tool_names)
+
     async def aconnect(
         self,
-        input_stream: AsyncIterator[str],
-        send_output_chunk: Callable[[str], Coroutine[Any, Any, None]],
+        input_stream: AsyncIterator[str | bytes],
+        send_output_chunk: Callable[[str | bytes], Coroutine[Any, Any, None]],
     ) -> None:
         """
         Connect to the AssemblyAI API and send and receive messages.
 
-        input_stream: AsyncIterator[str]
-            Stream of input events to send to the model. Usually transports audio data from the microphone.
-        send_output_chunk: Callable[[str], None]
-            Callback to receive output events from the model. Usually sends audio events to the speaker.
+        input_stream: AsyncIterator[str | bytes]
+            Stream of input events to send to the model. Usually transports audio data from the microphone,
+            either as raw PCM16 bytes or as JSON `input_audio_buffer.append` events with base64 audio.
+        send_output_chunk: Callable[[str | bytes], None]
+            Callback to receive output events from the model. JSON events are sent as str; audio is sent
+            as a binary frame (AUDIO_DELTA_FRAME_PREFIX followed by raw PCM16).
         """
         # Ensure agent exists (create if needed)
         agent_id = await self._ensure_agent()
         
         tools_by_name = {tool.name: tool for tool in (self.tools or [])}
         tool_executor = VoiceToolExecutor(tools_by_name=tools_by_name)
-        
-        # Track latest user input and AI response for message exchange
-        latest_user_input: str | None = None
-        latest_ai_response: str | None = None
 
-        async with connect(
-            api_key=self.api_key.get_secret_value(),
-            agent_id=agent_id,
-            url=self.url
-        ) as (
-            model_send,
-            model_receive_stream,
-        ):
-            # Note: AssemblyAI agents are configured via REST API, not WebSocket
-            # session.created event will come through the stream naturally
-            
-            async for stream_key, data_raw in amerge(
-                input_mic=input_stream,
-                output_speaker=model_receive_stream,
-                tool_outputs=tool_executor.output_iterator(),
-            ):
-                # Parse data based on its type and stream source
-                data = None
-                
-                if stream_key == "input_mic":
-                    parsed_mic_data = json.loads(data_raw)
-                    if isinstance(parsed_mic_data, dict):
-                        data = parsed_mic_data
-                    else:
-                        print(f"unexpected input_mic data type: {type(data_raw)}, value: {data_raw}")
-                        continue
+        # The conversation doesn't change during a connection, so read it once
+        conversation_id = current_conversation_id.get() if MESSAGE_TRACKING_AVAILABLE else None
+        
+        async def denoise(audio_bytes: bytes) -> bytes:
+            """Spectral gating on a worker thread so the FFTs don't block the event loop."""
+            return await asyncio.to_thread(
+                reduce_noise_pcm,
+                audio_bytes,
+                sample_rate=24000,  # OpenAI Realtime API uses 24kHz
+                stationary=False,  # Non-stationary for varying noise
+                prop_decrease=0.8,  # Reduce 80% of noise
+            )
 
-                elif stream_key == "output_speaker":
-                    #print("EVENT: Output speaker")
-                    # Output stream from model_receive_stream yields dicts
-                    if isinstance(data_raw, dict):
-                        data = data_raw
-                    else:
-                        print(f"unexpected output_speaker data type: {type(data_raw)}, value: {data_raw}")
-                        continue
-                        
-                elif stream_key == "tool_outputs":
-                    # Tool outputs are dicts
-                    if isinstance(data_raw, dict):
-                        data = data_raw
-                    else:
-                        print(f"unexpected tool_outputs data type: {type(data_raw)}")
-                        continue
-                
+        async def pump_mic() -> None:
+            """Forward client input (raw PCM16 frames or JSON events) to the model."""
+            async for data_raw in input_stream:
+                if isinstance(data_raw, (bytes, bytearray, memoryview)):
+                    # Raw PCM16 binary frame from the client, no base64 round trip
+                    await model_send(await denoise(data_raw))
+                    continue
 
-                # Ensure data is a dictionary
-                if not isinstance(data, dict):
-                    print(f"data is not a dict after parsing: {type(data)}, value: {data}")
+                # Only JSON objects are control/audio events; skip decoding anything else
+                if not data_raw.startswith("{"):
+                    print(f"unexpected input_mic data: {data_raw[:100]}")
                     continue
 
-                if stream_key == "input_mic":
-                    
-                    # Handle input from client
-                    event_type = data.get("type")
-                    
-                    if event_type == "input_audio_buffer.append":
-                        # Send binary audio data                        
-                        audio_data = data.get("audio")
-
-                        # Process the audio with spectral gating
-                        processed_audio = process_audio_with_spectral_gating(
-                            audio_data,
-                            sample_rate=24000,  # OpenAI Realtime API uses 24kHz
-                            stationary=False,  # Non-stationary for varying noise
-                            prop_decrease=0.8,  # Reduce 80% of noise
-                        )
-
-                        # Base64 encoded audio - decode first
-                        audio_bytes = base64.b64decode(processed_audio)
-                        
-                        await model_send(audio_bytes)
+                data = orjson.loads(data_raw)
 
-                    else:
-                        # Send other events as JSON
-                        await model_send(data)
-                        
-                elif stream_key == "tool_outputs":
-                    print("tool output", data)
+                if data.get("type") == "input_audio_buffer.append":
+                    # Base64 encoded audio - decode once, then process the PCM with spectral gating
+                    audio_bytes = a2b_base64(data.get("audio"))
+                    await model_send(await denoise(audio_bytes))
+                else:
+                    # Send other events as JSON
                     await model_send(data)
-                    
-                elif stream_key == "output_speaker":
+
+        async def pump_tools() -> None:
+            """Send tool results back to the model as they complete."""
+            async for data in tool_executor.output_iterator():
+                print("tool output", data)
+                await model_send(data)
+
+        async def save_message_exchange(user_input: str, ai_response: str) -> None:
+            """Persist a message exchange on a worker thread so the DB write doesn't block the event loop."""
+            try:
+                await asyncio.to_thread(
+                    create_message_exchange,
+                    conversation_id=conversation_id,
+                    user_input=user_input,
+                    ai_response=ai_response,
+                    input_tokens=None,  # AssemblyAI doesn't provide token counts in the same way
+                    output_tokens=None,
+                    total_tokens=None,
+                )
+            except Exception as e:
+                print(f"Error saving message exchange: {e}")
+
+        async def pump_model() -> None:
+            """Handle model events and forward them to the client."""
+            # Track latest user input and AI response for message exchange
+            latest_user_input: str | None = None
+            latest_ai_response: str | None = None
+
+            audio_batcher = AudioFrameBatcher(send_output_chunk)
+            try:
+                async for data in model_receive_stream:
+                    if not isinstance(data, dict):
+                        print(f"unexpected output_speaker data type: {type(data)}, value: {data}")
+                        continue
+
                     event_type = data.get("type")
-                    
+                
+                    if event_type == "audio":
+                        # Binary audio response from server, batched into binary frames
+                        await audio_batcher.push(data.get("data"))
+                        continue
+                
+                    # Pending audio goes out before any other event to keep ordering
+                    await audio_batcher.flush()
+                
                     # Handle session.created event (sent when WebSocket connection is established)
                     if event_type == "session.created":
                         print("****Session created")
-                        await send_output_chunk(json.dumps(data))
-                        continue
-                    
-                    elif event_type == "audio":
-                        # Binary audio response from server
-                        audio_data = data.get("data")
-
-                        # Base64 encode for JSON transport
-                        encoded_audio = base64.b64encode(audio_data).decode('utf-8')
-                        
-                        await send_output_chunk(json.dumps({
-                            "type": "response.audio.delta",
-                            "delta": encoded_audio,
-                        }))
-
+                        await send_output_chunk(orjson.dumps(data).decode())
+                
                     elif event_type == "conversation.item.done":
                         print("conversation.item.done", data)
                         # Conversation item completed
                         item = data.get("item", {})
                         item_type = item.get("type")
-                        
+                    
                         if item_type == "message":
                             # Extract message content
                             content = item.get("content", "")
                             role = item.get("role", "assistant")
-                            
+                        
                             if role == "user":
                                 latest_user_input = content
                             elif role == "assistant":
                                 latest_ai_response = content
-                            
+                        
                             # Forward the event
-                            await send_output_chunk(json.dumps(data))
-                            
-                            # Save message exchange when conversation item is done
-                            if MESSAGE_TRACKING_AVAILABLE:
-                                conversation_id = current_conversation_id.get()
-                                if conversation_id:
-                                    # Try to save message exchange if we have both
-                                    if latest_user_input and latest_ai_response:
-                                        try:
-                                            create_message_exchange(
-                                                conversation_id=conversation_id,
-                                                user_input=latest_user_input,
-                                                ai_response=latest_ai_response,
-                                                input_tokens=None,  # AssemblyAI doesn't provide token counts in the same way
-                                                output_tokens=None,
-                                                total_tokens=None,
-                                            )
-                                            # Reset for next exchange
-                                            latest_user_input = None
-                                            latest_ai_response = None
-                                        except Exception as e:
-                                            print(f"Error saving message exchange: {e}")
-                        elif item_type == "function_call":
-                            # Tool call completed
-                            await send_output_chunk(json.dumps(data))
+                            await send_output_chunk(orjson.dumps(data).decode())
+                        
+                            # Save message exchange when conversation item is done, once we have both
+                            if conversation_id and latest_user_input and latest_ai_response:
+                                task_group.create_task(
+                                    save_message_exchange(latest_user_input, latest_ai_response)
+                                )
+                                # Reset for next exchange
+                                latest_user_input = None
+                                latest_ai_response = None
                         else:
-                            await send_output_chunk(json.dumps(data))
-                            
+                            # Tool call completed, or other item types
+                            await send_output_chunk(orjson.dumps(data).decode())
+                        
                     elif event_type == "conversation.item.interim":
                         # Interim transcription
                         item = data.get("item", {})
                         if item.get("type") == "message":
                             transcript = item.get("content", "")
-                            await send_output_chunk(json.dumps({
+                            await send_output_chunk(orjson.dumps({
                                 "type": "conversation.item.interim",
                                 "transcript": transcript
-                            }))
-                            
+                            }).decode())
+                        
                     elif event_type == "tool.call":
                         # Tool call from agent
                         # According to docs: Server sends tool.call event with name and arguments
@@ -612,16 +732,36 @@ class AssemblyAIVoiceReactAgent(BaseModel):
                             "tool_call_id": data.get("tool_call_id", data.get("id")),
                         }
                         await tool_executor.add_tool_call(tool_call_data)
-                        
+                    
                     elif event_type == "error":
                         print("error:", data)
-                        await send_output_chunk(json.dumps(data))
-                        
+                        await send_output_chunk(orjson.dumps(data).decode())
+                    
                     elif event_type in EVENTS_TO_IGNORE:
                         pass
                     else:
                         # Forward other events
-                        await send_output_chunk(json.dumps(data))
+                        await send_output_chunk(orjson.dumps(data).decode())
+                await audio_batcher.flush()
+            finally:
+                await audio_batcher.close()
+
+        async with connect(
+            api_key=self.api_key.get_secret_value(),
+            agent_id=agent_id,
+            url=self.url
+        ) as (
+            model_send,
+            model_receive_stream,
+        ):
+            # Note: AssemblyAI agents are configured via REST API, not WebSocket
+            # session.created event will come through the stream naturally
+            
+            # Each direction is pumped by its own task; if one fails the others are cancelled
+            async with asyncio.TaskGroup() as task_group:
+                task_group.create_task(pump_mic())
+                task_group.create_task(pump_model())
+                task_group.create_task(pump_tools())
                 
 
 __all__ = ["AssemblyAIVoiceReactAgent"]
@@ -1,25 +0,0 @@
-import asyncio
-from typing import AsyncIterator, TypeVar
-
-T = TypeVar("T")
-
-
-async def amerge(**streams: AsyncIterator[T]) -> AsyncIterator[tuple[str, T]]:
-    """Merge multiple streams into one stream."""
-    nexts: dict[asyncio.Task, str] = {
-        asyncio.create_task(anext(stream)): key for key, stream in streams.items()
-    }
-    while nexts:
-        done, _ = await asyncio.wait(nexts, return_when=asyncio.FIRST_COMPLETED)
-        for task in done:
-            key = nexts.pop(task)
-            stream = streams[key]
-            try:
-                yield key, task.result()
-                nexts[asyncio.create_task(anext(stream))] = key
-            except StopAsyncIteration:
-                pass
-            except Exception as e:
-                for task in nexts:
-                    task.cancel()
-                raise e
@@ -4,9 +4,10 @@ from starlette.websockets import WebSocket
 from .constants_assemblyai import SYSTEM_INSTRUCTION_VOICE
 from .langchain_assemblyai import AssemblyAIVoiceReactAgent
 from utils.tools import TOOLS_ARRAY, current_websocket, appointment_booked, current_conversation_id
-from .websocket_utils import websocket_stream
+from .websocket_utils import websocket_stream, send_output_chunk
 from auth import verify_api_key, verify_websocket_api_key
 from database import create_conversation, end_conversation
+import functools
 import os
 import traceback
 
@@ -56,7 +57,7 @@ async def websocket_endpoint(websocket: WebSocket):
     )
 
     try:
-        await agent.aconnect(browser_receive_stream, websocket.send_text)
+        await agent.aconnect(browser_receive_stream, functools.partial(send_output_chunk, websocket))
     except Exception as e:
         print(f"Error in aconnect: {e}")
         traceback.print_exc()
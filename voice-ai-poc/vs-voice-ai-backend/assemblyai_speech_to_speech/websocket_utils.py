@@ -1,8 +1,22 @@
 from typing import AsyncIterator
-from starlette.websockets import WebSocket
+from starlette.websockets import WebSocket, WebSocketDisconnect
 
 
-async def websocket_stream(websocket: WebSocket) -> AsyncIterator[str]:
+async def websocket_stream(websocket: WebSocket) -> AsyncIterator[str | bytes]:
+    """Yield text frames as str and binary (raw PCM16 audio) frames as bytes."""
     while True:
-        data = await websocket.receive_text()
-        yield data
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+        if message.get("bytes") is not None:
+            yield message["bytes"]
+        else:
+            yield message["text"]
+
+
+async def send_output_chunk(websocket: WebSocket, chunk: str | bytes) -> None:
+    """Send JSON events as text frames and framed audio as binary frames."""
+    if isinstance(chunk, str):
+        await websocket.send_text(chunk)
+    else:
+        await websocket.send_bytes(chunk)
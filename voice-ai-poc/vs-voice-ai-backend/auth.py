@@ -1,7 +1,7 @@
 from fastapi import HTTPException, Header, status
 from starlette.websockets import WebSocket
 
-from database import get_user_by_api_key
+from database import aget_user_by_api_key
 
 API_KEY_HEADER = "X-API-Key"
 
@@ -17,7 +17,7 @@ async def verify_api_key(api_key: str = Header(..., alias=API_KEY_HEADER)) -> di
             detail="API key is required"
         )
     
-    user = get_user_by_api_key(api_key)
+    user = await aget_user_by_api_key(api_key)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -38,7 +38,7 @@ async def verify_websocket_api_key(websocket: WebSocket) -> dict:
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="API key is required")
         raise ValueError("API key is required")
     
-    user = get_user_by_api_key(api_key)
+    user = await aget_user_by_api_key(api_key)
     if not user:
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid API key")
         raise ValueError("Invalid API key")
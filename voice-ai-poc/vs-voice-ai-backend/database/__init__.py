@@ -1,34 +1,129 @@
+import asyncio
+import hashlib
+import queue
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from contextlib import contextmanager
-from datetime import datetime
 from pathlib import Path
+from typing import Callable, Iterator, NamedTuple
 
 _current_file = Path(__file__).resolve()
 _project_root = _current_file.parent.parent
 DB_PATH = _project_root / "data" / "voice-ai.db"
 
+# API key -> user lookups are cached in-process; unknown keys are cached briefly too
+API_KEY_CACHE_TTL = 60.0
+API_KEY_NEGATIVE_CACHE_TTL = 5.0
+API_KEY_CACHE_MAX_SIZE = 10_000
+_api_key_cache: OrderedDict[str, tuple[dict | None, float]] = OrderedDict()
+_api_key_cache_lock = threading.Lock()
+
+# Listing results (get_all_users, get_all_conversations) are cached briefly; writes made
+# through this module drop them immediately, the TTL bounds staleness from other processes
+LISTING_CACHE_TTL = 5.0
+LISTING_CACHE_MAX_SIZE = 128
+
+# Data directories already created by _ensure_data_dir
+_data_dirs_ready: set[Path] = set()
+
+# Number of idle connections kept open for reuse
+DB_POOL_SIZE = 8
+# Prepared statements kept per connection (sqlite3 keys them by SQL text)
+DB_CACHED_STATEMENTS = 256
+
+# Applied to every new connection: WAL with NORMAL sync makes each commit a WAL
+# append instead of an fsync of the main file, and lets readers run during writes
+DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",  # 64 MB page cache
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA mmap_size=268435456",  # 256 MB
+)
+
+# Current UTC time as an ISO 8601 string, computed by SQLite at insert/update time
+SQL_UTC_NOW = "strftime('%Y-%m-%dT%H:%M:%f', 'now')"
+
+MESSAGE_EXCHANGE_INSERT = f"""INSERT INTO message_exchanges 
+    (conversation_id, timestamp, user_input, ai_response, input_tokens, output_tokens, total_tokens)
+    VALUES (?, COALESCE(?, {SQL_UTC_NOW}), ?, ?, ?, ?, ?)"""
+
 # Export DB_PATH for use in backup scripts
 __all__ = ['DB_PATH', 'init_database', 'get_db_connection', 'get_user_by_api_key', 
            'create_user', 'get_all_users', 'create_conversation', 'end_conversation',
            'update_conversation_rating', 'get_conversation_by_id', 'create_message_exchange',
-           'get_all_conversations', 'get_message_exchanges_by_conversation_id']
+           'get_all_conversations', 'get_message_exchanges_by_conversation_id',
+           'invalidate_api_key', 'create_message_exchanges_bulk', 'aget_user_by_api_key',
+           'hash_api_key', 'iter_conversations', 'UserRow', 'ConversationRow', 'MessageExchangeRow',
+           'run_maintenance']
+
+
+USERS_TABLE_SQL = """
+    CREATE TABLE {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT NOT NULL UNIQUE,
+        api_key_hash BLOB NOT NULL UNIQUE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def hash_api_key(api_key: str) -> bytes:
+    """16-byte BLAKE2b digest of an API key; only this is stored, never the key itself."""
+    return hashlib.blake2b(api_key.encode(), digest_size=16).digest()
+
+
+class UserRow(NamedTuple):
+    id: int
+    username: str
+    created_at: str
+
+
+class ConversationRow(NamedTuple):
+    id: int
+    user_id: int
+    username: str | None
+    start_time: str
+    end_time: str | None
+    rating: int | None
+    appointment_booked: int
+
+
+class MessageExchangeRow(NamedTuple):
+    id: int
+    conversation_id: int
+    timestamp: str
+    user_input: str | None
+    ai_response: str | None
+    input_tokens: int | None
+    output_tokens: int | None
+    total_tokens: int | None
+
+
+def _row_factory(row_type: type[NamedTuple]) -> Callable[[sqlite3.Cursor, tuple], NamedTuple]:
+    """sqlite3 row factory that builds row_type tuples instead of sqlite3.Row."""
+    make = row_type._make
+    return lambda cursor, row: make(row)
+
+
+def _ensure_data_dir(directory: Path) -> None:
+    """Create the data directory, once per directory per process."""
+    if directory in _data_dirs_ready:
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    _data_dirs_ready.add(directory)
 
 
 def init_database():
     """Initialize the database and create the users and conversations tables if they don't exist."""
-    # Ensure the data directory exists
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    _ensure_data_dir(DB_PATH.parent)
     with get_db_connection() as conn:
         cursor = conn.cursor()
         # Create users table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT NOT NULL UNIQUE,
-                api_key TEXT NOT NULL UNIQUE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+        cursor.execute(USERS_TABLE_SQL.format(name="IF NOT EXISTS users"))
         # Create conversations table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS conversations (
@@ -55,31 +150,225 @@ def init_database():
                 FOREIGN KEY (conversation_id) REFERENCES conversations(id) ON DELETE CASCADE
             )
         """)
+        # Indices for listing conversations newest first and reading a conversation's exchanges in order
+        # (users.api_key_hash already has the implicit index from its UNIQUE constraint)
+        # (start_time, id) scanned backwards serves the (start_time DESC, id DESC) keyset listing;
+        # it replaces the earlier start_time-only index
+        cursor.execute("DROP INDEX IF EXISTS idx_conv_start")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_conv_start_id ON conversations(start_time, id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_conv_user_start ON conversations(user_id, start_time DESC)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_msg_conv_ts ON message_exchanges(conversation_id, timestamp)")
+        conn.commit()
+        _migrate_plaintext_api_keys(conn)
+        # Refresh query planner statistics for the tables and indices above
+        conn.execute("ANALYZE")
+    # Open the pooled connections up front so the first requests don't pay for it
+    _pool.warm()
+
+
+def _migrate_plaintext_api_keys(conn: sqlite3.Connection) -> None:
+    """Rebuild a users table that still stores plaintext api_key values with api_key_hash instead."""
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(users)")}
+    if "api_key" not in columns:
+        return
+
+    # Dropping users with foreign keys on would cascade-delete every conversation
+    conn.execute("PRAGMA foreign_keys=OFF")
+    try:
+        conn.execute("BEGIN")
+        users = conn.execute("SELECT id, username, api_key, created_at FROM users").fetchall()
+        conn.execute(USERS_TABLE_SQL.format(name="users_new"))
+        conn.executemany(
+            "INSERT INTO users_new (id, username, api_key_hash, created_at) VALUES (?, ?, ?, ?)",
+            [(user["id"], user["username"], hash_api_key(user["api_key"]), user["created_at"]) for user in users],
+        )
+        conn.execute("DROP TABLE users")
+        conn.execute("ALTER TABLE users_new RENAME TO users")
         conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute("PRAGMA foreign_keys=ON")
+
+
+def run_maintenance() -> None:
+    """
+    Periodic upkeep: fold the WAL back into the database file and truncate it,
+    and let SQLite refresh planner statistics where they have gone stale.
+    """
+    with get_db_connection() as conn:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("PRAGMA optimize")
+
+
+class _ConnectionPool:
+    """
+    Thread-safe LIFO pool of long-lived SQLite connections.
+
+    Each connection is checked out by one thread at a time, so connections are
+    opened with check_same_thread=False and handed between worker threads.
+    Connections are tagged with the DB_PATH they were opened for, so changing
+    DB_PATH (e.g. init_database.py --db-path) retires the old ones.
+    """
+
+    def __init__(self, size: int):
+        self._size = size
+        self._connections: queue.LifoQueue[tuple[Path, sqlite3.Connection]] = queue.LifoQueue(maxsize=size)
+
+    @staticmethod
+    def _connect(path: Path) -> sqlite3.Connection:
+        _ensure_data_dir(path.parent)
+        conn = sqlite3.connect(path, check_same_thread=False, cached_statements=DB_CACHED_STATEMENTS)
+        conn.row_factory = sqlite3.Row  # Enable column access by name
+        for pragma in DB_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self) -> tuple[Path, sqlite3.Connection]:
+        """Take an idle connection for the current DB_PATH, opening one if none is idle."""
+        path = DB_PATH
+        while True:
+            try:
+                conn_path, conn = self._connections.get_nowait()
+            except queue.Empty:
+                return path, self._connect(path)
+            if conn_path == path:
+                return conn_path, conn
+            conn.close()
+
+    def release(self, path: Path, conn: sqlite3.Connection) -> None:
+        """Return a connection to the pool, discarding anything left uncommitted."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.close()
+            return
+        if path != DB_PATH:
+            conn.close()
+            return
+        try:
+            self._connections.put_nowait((path, conn))
+        except queue.Full:
+            conn.close()
+
+    def warm(self) -> None:
+        """Fill the pool with open connections."""
+        connections = [self.acquire() for _ in range(self._size)]
+        for path, conn in connections:
+            self.release(path, conn)
+
+
+_pool = _ConnectionPool(DB_POOL_SIZE)
 
 
 @contextmanager
 def get_db_connection():
-    """Context manager for database connections."""
-    # Ensure the data directory exists
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row  # Enable column access by name
+    """Context manager for database connections, borrowed from the connection pool."""
+    path, conn = _pool.acquire()
     try:
         yield conn
     finally:
-        conn.close()
+        _pool.release(path, conn)
+
+
+class _ListingCache:
+    """
+    Short-TTL cache of listing query results keyed by (query, args).
+
+    Writes call invalidate(), which bumps a version counter; a result loaded while a
+    write happened is returned but not cached, so stale rows are never stored.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self._ttl = ttl
+        self._max_size = max_size
+        self._version = 0
+        self._entries: OrderedDict[tuple, tuple[list[tuple], float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key: tuple, load: Callable[[], list[tuple]]) -> list[tuple]:
+        """Return the cached rows for key (in a new list), loading them on a miss."""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                return list(cached[0])
+            version = self._version
+
+        rows = load()
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = (list(rows), time.monotonic() + self._ttl)
+                self._entries.move_to_end(key)
+                if len(self._entries) > self._max_size:
+                    self._entries.popitem(last=False)
+        return rows
+
+    def invalidate(self) -> None:
+        """Drop all cached results after a write."""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+
+_listing_cache = _ListingCache(LISTING_CACHE_TTL, LISTING_CACHE_MAX_SIZE)
+
+
+def _get_cached_user(api_key: str) -> tuple[bool, dict | None]:
+    """Look up an API key in the cache. Returns (hit, copy of the cached user or None)."""
+    with _api_key_cache_lock:
+        cached = _api_key_cache.get(api_key)
+        if cached is None or cached[1] <= time.monotonic():
+            return False, None
+        _api_key_cache.move_to_end(api_key)
+        user = cached[0]
+    return True, (dict(user) if user is not None else None)
 
 
 def get_user_by_api_key(api_key: str) -> dict | None:
-    """Get user by API key. Returns None if not found."""
+    """
+    Get user by API key. Returns {'id', 'username'}, or None if not found.
+    Results are cached for API_KEY_CACHE_TTL seconds.
+    """
+    hit, user = _get_cached_user(api_key)
+    if hit:
+        return user
+
+    now = time.monotonic()
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE api_key = ?", (api_key,))
+        # Plain tuples for the hot auth path; callers only need the id and username
+        cursor.row_factory = None
+        cursor.execute("SELECT id, username FROM users WHERE api_key_hash = ?", (hash_api_key(api_key),))
         row = cursor.fetchone()
-        if row:
-            return dict(row)
-        return None
+        user = {"id": row[0], "username": row[1]} if row else None
+
+    ttl = API_KEY_CACHE_TTL if user is not None else API_KEY_NEGATIVE_CACHE_TTL
+    with _api_key_cache_lock:
+        _api_key_cache[api_key] = (user, now + ttl)
+        _api_key_cache.move_to_end(api_key)
+        if len(_api_key_cache) > API_KEY_CACHE_MAX_SIZE:
+            _api_key_cache.popitem(last=False)
+    return dict(user) if user is not None else None
+
+
+async def aget_user_by_api_key(api_key: str) -> dict | None:
+    """
+    Async get_user_by_api_key for the event loop. Cache hits return immediately;
+    misses query SQLite on a worker thread so the loop isn't blocked.
+    """
+    hit, user = _get_cached_user(api_key)
+    if hit:
+        return user
+    return await asyncio.to_thread(get_user_by_api_key, api_key)
+
+
+def invalidate_api_key(api_key: str) -> None:
+    """Drop a cached get_user_by_api_key result, e.g. after the key is created or revoked."""
+    with _api_key_cache_lock:
+        _api_key_cache.pop(api_key, None)
 
 
 def create_user(username: str, api_key: str) -> bool:
@@ -88,21 +377,28 @@ def create_user(username: str, api_key: str) -> bool:
         with get_db_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "INSERT INTO users (username, api_key) VALUES (?, ?)",
-                (username, api_key)
+                "INSERT INTO users (username, api_key_hash) VALUES (?, ?)",
+                (username, hash_api_key(api_key))
             )
             conn.commit()
-            return True
+        invalidate_api_key(api_key)
+        _listing_cache.invalidate()
+        return True
     except sqlite3.IntegrityError:
         return False
 
 
-def get_all_users():
+def get_all_users() -> list[UserRow]:
     """Get all users (for admin purposes)."""
+    return _listing_cache.get_or_load(("users",), _load_all_users)
+
+
+def _load_all_users() -> list[UserRow]:
     with get_db_connection() as conn:
         cursor = conn.cursor()
+        cursor.row_factory = _row_factory(UserRow)
         cursor.execute("SELECT id, username, created_at FROM users")
-        return [dict(row) for row in cursor.fetchall()]
+        return cursor.fetchall()
 
 
 def create_conversation(user_id: int) -> int:
@@ -117,35 +413,44 @@ def create_conversation(user_id: int) -> int:
     """
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        start_time = datetime.utcnow().isoformat()
         cursor.execute(
-            "INSERT INTO conversations (user_id, start_time) VALUES (?, ?)",
-            (user_id, start_time)
+            f"INSERT INTO conversations (user_id, start_time) VALUES (?, {SQL_UTC_NOW}) RETURNING id",
+            (user_id,)
         )
+        conversation_id = cursor.fetchone()[0]
         conn.commit()
-        return cursor.lastrowid
+        _listing_cache.invalidate()
+        return conversation_id
 
 
-def end_conversation(conversation_id: int, appointment_booked: bool = False) -> bool:
+def end_conversation(
+    conversation_id: int,
+    appointment_booked: bool = False,
+    message_exchanges: list[dict] | None = None,
+) -> bool:
     """
     Update a conversation record when a conversation ends.
     
     Parameters:
         conversation_id (int): The ID of the conversation to update.
         appointment_booked (bool): Whether an appointment was successfully booked.
+        message_exchanges (list[dict] | None): Pending message exchanges to write in the
+            same transaction, in the format accepted by create_message_exchanges_bulk.
     
     Returns:
         bool: True if the conversation was updated successfully, False otherwise.
     """
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        end_time = datetime.utcnow().isoformat()
+        if message_exchanges:
+            cursor.executemany(MESSAGE_EXCHANGE_INSERT, _message_exchange_rows(message_exchanges))
         appointment_booked_int = 1 if appointment_booked else 0
         cursor.execute(
-            "UPDATE conversations SET end_time = ?, appointment_booked = ? WHERE id = ?",
-            (end_time, appointment_booked_int, conversation_id)
+            f"UPDATE conversations SET end_time = {SQL_UTC_NOW}, appointment_booked = ? WHERE id = ?",
+            (appointment_booked_int, conversation_id)
         )
         conn.commit()
+        _listing_cache.invalidate()
         return cursor.rowcount > 0
 
 
@@ -167,6 +472,7 @@ def update_conversation_rating(conversation_id: int, rating: int) -> bool:
             (rating, conversation_id)
         )
         conn.commit()
+        _listing_cache.invalidate()
         return cursor.rowcount > 0
 
 
@@ -213,14 +519,11 @@ def create_message_exchange(
     """
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        timestamp = datetime.utcnow().isoformat()
         cursor.execute(
-            """INSERT INTO message_exchanges 
-               (conversation_id, timestamp, user_input, ai_response, input_tokens, output_tokens, total_tokens)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            MESSAGE_EXCHANGE_INSERT + " RETURNING id",
             (
                 conversation_id,
-                timestamp,
+                None,  # timestamp: set by SQLite
                 user_input,
                 ai_response,
                 input_tokens,
@@ -228,20 +531,100 @@ def create_message_exchange(
                 total_tokens,
             ),
         )
+        message_exchange_id = cursor.fetchone()[0]
         conn.commit()
-        return cursor.lastrowid
+        return message_exchange_id
 
 
-def get_all_conversations():
+def _message_exchange_rows(message_exchanges: list[dict]) -> list[tuple]:
+    """Convert message exchange dicts to MESSAGE_EXCHANGE_INSERT parameter rows."""
+    return [
+        (
+            exchange["conversation_id"],
+            exchange.get("timestamp"),  # None: set by SQLite
+            exchange.get("user_input"),
+            exchange.get("ai_response"),
+            exchange.get("input_tokens"),
+            exchange.get("output_tokens"),
+            exchange.get("total_tokens"),
+        )
+        for exchange in message_exchanges
+    ]
+
+
+def create_message_exchanges_bulk(message_exchanges: list[dict]) -> int:
     """
-    Get all conversations with user information.
+    Create several message exchange records in a single transaction.
+    
+    Parameters:
+        message_exchanges (list[dict]): Exchanges with the same keys as the
+            create_message_exchange parameters (conversation_id is required),
+            plus an optional ISO "timestamp" that defaults to now.
     
     Returns:
-        list: List of conversation records with user information.
+        int: The number of message exchange records created.
     """
+    if not message_exchanges:
+        return 0
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
+        cursor.executemany(MESSAGE_EXCHANGE_INSERT, _message_exchange_rows(message_exchanges))
+        conn.commit()
+        return cursor.rowcount
+
+
+def get_all_conversations(
+    limit: int = 50,
+    before_start_time: str | None = None,
+    before_id: int | None = None,
+) -> list[ConversationRow]:
+    """
+    Get a page of conversations with user information, newest first.
+    
+    Parameters:
+        limit (int): Maximum number of conversations to return.
+        before_start_time (str | None): Only return conversations that come after this
+            position in the listing; pass the start_time and id of the last conversation
+            of a page to get the next page.
+        before_id (int | None): Breaks ties between conversations with the same
+            start_time; without it, every conversation at before_start_time is skipped.
+    
+    Returns:
+        list[ConversationRow]: Conversation records with user information.
+    """
+    return _listing_cache.get_or_load(
+        ("conversations", limit, before_start_time, before_id),
+        lambda: _load_conversations(limit, before_start_time, before_id),
+    )
+
+
+def _load_conversations(limit: int, before_start_time: str | None, before_id: int | None) -> list[ConversationRow]:
+    return list(iter_conversations(limit, before_start_time, before_id))
+
+
+def iter_conversations(
+    limit: int = 50,
+    before_start_time: str | None = None,
+    before_id: int | None = None,
+) -> Iterator[ConversationRow]:
+    """
+    Stream a page of conversations with user information, newest first.
+    
+    Same query and parameters as get_all_conversations, but yields rows straight
+    from the cursor (uncached) while holding a pooled connection.
+    """
+    # Keyset pagination on (start_time, id): seek on the start_time index instead of
+    # skipping rows with OFFSET, without losing conversations that share a start_time
+    if before_start_time is None:
+        where, params = "", (limit,)
+    elif before_id is None:
+        where, params = "WHERE c.start_time < ?", (before_start_time, limit)
+    else:
+        where, params = "WHERE (c.start_time, c.id) < (?, ?)", (before_start_time, before_id, limit)
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = _row_factory(ConversationRow)
+        cursor.execute(f"""
             SELECT 
                 c.id,
                 c.user_id,
@@ -252,27 +635,48 @@ def get_all_conversations():
                 c.appointment_booked
             FROM conversations c
             LEFT JOIN users u ON c.user_id = u.id
-            ORDER BY c.start_time DESC
-        """)
-        return [dict(row) for row in cursor.fetchall()]
+            {where}
+            ORDER BY c.start_time DESC, c.id DESC
+            LIMIT ?
+        """, params)
+        yield from cursor
 
 
-def get_message_exchanges_by_conversation_id(conversation_id: int):
+def get_message_exchanges_by_conversation_id(
+    conversation_id: int,
+    limit: int = 200,
+    after_timestamp: str | None = None,
+    after_id: int | None = None,
+) -> list[MessageExchangeRow]:
     """
-    Get all message exchanges for a specific conversation.
+    Get a page of message exchanges for a specific conversation, oldest first.
     
     Parameters:
         conversation_id (int): The ID of the conversation.
+        limit (int): Maximum number of message exchanges to return.
+        after_timestamp (str | None): Together with after_id, only return exchanges after
+            this one; pass the timestamp and id of the last exchange of a page to get the
+            next page.
+        after_id (int | None): The id of that exchange.
     
     Returns:
-        list: List of message exchange records for the conversation.
+        list[MessageExchangeRow]: Message exchange records for the conversation.
     """
+    # Keyset pagination on (timestamp, id), the same order the page is sorted in
+    if after_timestamp is not None and after_id is not None:
+        after, params = "AND (timestamp, id) > (?, ?)", (conversation_id, after_timestamp, after_id, limit)
+    else:
+        after, params = "", (conversation_id, limit)
     with get_db_connection() as conn:
         cursor = conn.cursor()
+        cursor.row_factory = _row_factory(MessageExchangeRow)
         cursor.execute(
-            """SELECT * FROM message_exchanges 
-               WHERE conversation_id = ? 
-               ORDER BY timestamp ASC""",
-            (conversation_id,)
+            f"""SELECT id, conversation_id, timestamp, user_input, ai_response,
+                      input_tokens, output_tokens, total_tokens
+               FROM message_exchanges 
+               WHERE conversation_id = ? {after}
+               ORDER BY timestamp ASC, id ASC
+               LIMIT ?""",
+            params
         )
-        return [dict(row) for row in cursor.fetchall()]
+        return cursor.fetchall()
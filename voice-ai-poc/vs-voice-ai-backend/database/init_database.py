@@ -7,17 +7,14 @@ It can be run from the command line to set up the database.
 
 Usage:
     python -m database.init_database
-    python database/init_database.py
 """
 
 import argparse
 import sys
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
+from . import init_database, get_db_connection
 import database
-from database import init_database, get_db_connection
 
 
 def main():
@@ -1,45 +1,66 @@
 #!/usr/bin/env python3
 """
 Utility script to manage conversations and message exchanges in the database.
+
+Usage:
+    python -m database.manage_conversations
 """
 import sys
-from pathlib import Path
-
-# Add parent directory to path so we can import database module
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from database import (
-    get_all_conversations,
+from . import (
     get_conversation_by_id,
     get_message_exchanges_by_conversation_id,
+    iter_conversations,
 )
 
 
-def list_conversations():
-    """List all conversations."""
-    conversations = get_all_conversations()
-    print(f"\nTotal conversations: {len(conversations)}")
-    print("=" * 100)
-    print(f"{'ID':<6} {'User ID':<8} {'Username':<30} {'Start Time':<25} {'End Time':<25} {'Rating':<8} {'Appt Booked':<12}")
+CONVERSATIONS_PAGE_SIZE = 50
+MESSAGE_EXCHANGES_PAGE_SIZE = 200
+
+# Row formats, built once; text columns are padded and cut to their column width
+CONVERSATION_ROW_FORMAT = "{:<6} {:<8} {:<30.30} {:<25.25} {:<25.25} {:<8} {:<12}".format
+MESSAGE_EXCHANGE_FORMAT = (
+    "\n--- Exchange #{} ---\n"
+    "ID: {}\n"
+    "Timestamp: {}\n"
+    "User Input: {}\n"
+    "AI Response: {}\n"
+    "Tokens - Input: {}, Output: {}, Total: {}\n"
+    + "-" * 120
+).format
+
+
+def list_conversations(
+    limit: int = CONVERSATIONS_PAGE_SIZE,
+    before_start_time: str | None = None,
+    before_id: int | None = None,
+):
+    """List a page of conversations, newest first, printing rows as they are read."""
+    print("\n" + "=" * 100)
+    print(CONVERSATION_ROW_FORMAT('ID', 'User ID', 'Username', 'Start Time', 'End Time', 'Rating', 'Appt Booked'))
     print("-" * 100)
     
-    for conv in conversations:
-        conv_id = conv.get('id', 'N/A')
-        user_id = conv.get('user_id', 'N/A')
-        username = conv.get('username', 'N/A') or 'N/A'
-        start_time = conv.get('start_time', 'N/A') or 'N/A'
-        end_time = conv.get('end_time', 'N/A') or 'N/A'
-        rating = conv.get('rating', 'N/A') if conv.get('rating') is not None else 'N/A'
-        appointment_booked = 'Yes' if conv.get('appointment_booked', 0) == 1 else 'No'
-        
-        # Truncate long usernames and timestamps for display
-        username = username[:28] + '..' if len(username) > 30 else username
-        start_time = start_time[:23] if len(start_time) > 25 else start_time
-        end_time = end_time[:23] if len(end_time) > 25 else end_time
-        
-        print(f"{conv_id:<6} {user_id:<8} {username:<30} {start_time:<25} {end_time:<25} {rating:<8} {appointment_booked:<12}")
+    shown = 0
+    last_start_time = last_id = None
+    for conv_id, user_id, username, start_time, end_time, rating, appointment_booked in iter_conversations(
+        limit=limit, before_start_time=before_start_time, before_id=before_id
+    ):
+        shown += 1
+        last_start_time, last_id = start_time, conv_id
+        print(CONVERSATION_ROW_FORMAT(
+            conv_id,
+            user_id,
+            username or 'N/A',
+            start_time or 'N/A',
+            end_time or 'N/A',
+            'N/A' if rating is None else rating,
+            'Yes' if appointment_booked == 1 else 'No',
+        ))
     
     print("=" * 100)
+    print(f"Conversations shown: {shown}")
+    if shown == limit:
+        print(f'Next page: python -m database.manage_conversations list {limit} "{last_start_time}" {last_id}')
 
 
 def list_message_exchanges(conversation_id: int):
@@ -50,7 +71,18 @@ def list_message_exchanges(conversation_id: int):
         print(f"\n✗ Conversation with ID {conversation_id} not found")
         return
     
-    exchanges = get_message_exchanges_by_conversation_id(conversation_id)
+    # Read the exchanges page by page
+    exchanges = []
+    while True:
+        page = get_message_exchanges_by_conversation_id(
+            conversation_id,
+            limit=MESSAGE_EXCHANGES_PAGE_SIZE,
+            after_timestamp=exchanges[-1].timestamp if exchanges else None,
+            after_id=exchanges[-1].id if exchanges else None,
+        )
+        exchanges.extend(page)
+        if len(page) < MESSAGE_EXCHANGES_PAGE_SIZE:
+            break
     
     print(f"\nConversation ID: {conversation_id}")
     print(f"User ID: {conversation.get('user_id', 'N/A')}")
@@ -67,15 +99,16 @@ def list_message_exchanges(conversation_id: int):
         return
     
     for idx, exchange in enumerate(exchanges, 1):
-        print(f"\n--- Exchange #{idx} ---")
-        print(f"ID: {exchange.get('id', 'N/A')}")
-        print(f"Timestamp: {exchange.get('timestamp', 'N/A')}")
-        print(f"User Input: {exchange.get('user_input', 'N/A') or '(empty)'}")
-        print(f"AI Response: {exchange.get('ai_response', 'N/A') or '(empty)'}")
-        print(f"Tokens - Input: {exchange.get('input_tokens', 'N/A') or 'N/A'}, "
-              f"Output: {exchange.get('output_tokens', 'N/A') or 'N/A'}, "
-              f"Total: {exchange.get('total_tokens', 'N/A') or 'N/A'}")
-        print("-" * 120)
+        print(MESSAGE_EXCHANGE_FORMAT(
+            idx,
+            exchange.id,
+            exchange.timestamp,
+            exchange.user_input or '(empty)',
+            exchange.ai_response or '(empty)',
+            exchange.input_tokens or 'N/A',
+            exchange.output_tokens or 'N/A',
+            exchange.total_tokens or 'N/A',
+        ))
     
     print("=" * 120)
 
@@ -104,20 +137,31 @@ def main():
     
     if len(sys.argv) < 2:
         print("Usage:")
-        print("  python database/manage_conversations.py list                                    - List all conversations")
-        print("  python database/manage_conversations.py show <conversation_id>                   - Show conversation details")
-        print("  python database/manage_conversations.py messages <conversation_id>             - List message exchanges for a conversation")
+        print("  python -m database.manage_conversations list [limit] [before_start_time before_id] - List conversations, newest first")
+        print("  python -m database.manage_conversations show <conversation_id>                   - Show conversation details")
+        print("  python -m database.manage_conversations messages <conversation_id>             - List message exchanges for a conversation")
         return
     
     command = sys.argv[1].lower()
     
     if command == "list":
-        list_conversations()
+        try:
+            limit = int(sys.argv[2]) if len(sys.argv) > 2 else CONVERSATIONS_PAGE_SIZE
+        except ValueError:
+            print("Error: Limit must be a number")
+            return
+        before_start_time = sys.argv[3] if len(sys.argv) > 3 else None
+        try:
+            before_id = int(sys.argv[4]) if len(sys.argv) > 4 else None
+        except ValueError:
+            print("Error: Conversation ID must be a number")
+            return
+        list_conversations(limit=limit, before_start_time=before_start_time, before_id=before_id)
     
     elif command == "show":
         if len(sys.argv) < 3:
             print("Error: Conversation ID is required")
-            print("Usage: python database/manage_conversations.py show <conversation_id>")
+            print("Usage: python -m database.manage_conversations show <conversation_id>")
             return
         
         try:
@@ -129,7 +173,7 @@ def main():
     elif command == "messages":
         if len(sys.argv) < 3:
             print("Error: Conversation ID is required")
-            print("Usage: python database/manage_conversations.py messages <conversation_id>")
+            print("Usage: python -m database.manage_conversations messages <conversation_id>")
             return
         
         try:
@@ -141,7 +185,7 @@ def main():
     else:
         print(f"Unknown command: {command}")
         print("\nAvailable commands:")
-        print("  list                                    - List all conversations")
+        print("  list [limit] [before_start_time before_id] - List conversations, newest first")
         print("  show <conversation_id>                  - Show conversation details")
         print("  messages <conversation_id>               - List message exchanges for a conversation")
 
@@ -1,15 +1,14 @@
 #!/usr/bin/env python3
 """
 Utility script to manage users and API keys in the database.
+
+Usage:
+    python -m database.manage_users
 """
 import sys
 import secrets
-from pathlib import Path
-
-# Add parent directory to path so we can import database module
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from database import create_user, get_all_users, get_user_by_api_key
+from . import create_user, get_all_users, get_user_by_api_key
 
 
 def generate_api_key() -> str:
@@ -35,7 +34,7 @@ def list_users():
     print(f"\nTotal users: {len(users)}")
     print("-" * 60)
     for user in users:
-        print(f"ID: {user['id']}, Username: {user['username']}, Created: {user['created_at']}")
+        print(f"ID: {user.id}, Username: {user.username}, Created: {user.created_at}")
     print("-" * 60)
 
 
@@ -44,9 +43,9 @@ def main():
     
     if len(sys.argv) < 2:
         print("Usage:")
-        print("  python database/manage_users.py create <email> [api_key]  - Create a new user")
-        print("  python database/manage_users.py list                     - List all users")
-        print("  python database/manage_users.py verify <api_key>            - Verify an API key")
+        print("  python -m database.manage_users create <email> [api_key]  - Create a new user")
+        print("  python -m database.manage_users list                     - List all users")
+        print("  python -m database.manage_users verify <api_key>            - Verify an API key")
         return
     
     command = sys.argv[1].lower()
@@ -1,22 +1,73 @@
+import asyncio
+import functools
 import os
-from datetime import datetime
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime
+from string import Template
 
+import orjson
 from dotenv import load_dotenv
 
 from vetstoria.api import API
 
-load_dotenv()
+# Deployments that inject the environment directly can skip the .env lookup
+if os.getenv('SKIP_DOTENV') != '1':
+    load_dotenv()
 
 # Configuration
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 
-FIRST_NAME = "AI-booking"
-LAST_NAME = "AI-booking"
-NAME = "AI-booking"
-NOTES = "none"
 
-SYSTEM_INSTRUCTION_VOICE = (
-    f"""
+@dataclass(frozen=True, slots=True)
+class BookingIdentity:
+    """
+    Placeholder client details the agent uses when placing a booking.
+    """
+    first_name: str = sys.intern("AI-booking")
+    last_name: str = sys.intern("AI-booking")
+    notes: str = sys.intern("none")
+
+    @property
+    def name(self) -> str:
+        # The pet name placeholder matches the client's first name
+        return self.first_name
+
+
+BOOKING_IDENTITY = BookingIdentity()
+
+# Seconds before the clinic options are fetched again and the prompt rebuilt
+CLINIC_OPTIONS_CACHE_TTL = 600
+# Seconds to keep serving the previous prompt after a failed refresh before retrying
+CLINIC_OPTIONS_RETRY_DELAY = 30
+
+
+def _escape_template(value):
+    """Format a fetched value for the prompt template, escaping "$" as "$$"."""
+    return str(value).replace("$", "$$")
+
+
+def _build_system_instruction():
+    """
+    Build the voice agent prompt template, fetching the clinic options once.
+    The current date and time are left as ${date} and ${time} placeholders;
+    any "$" in the clinic options is escaped.
+    """
+    api = API()
+    # The three lookups are independent, so overlap their round trips
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        species_future = executor.submit(api.get_species)
+        appointment_types_future = executor.submit(api.get_appointment_types)
+        schedules_future = executor.submit(api.get_schedules)
+        _species = _escape_template(species_future.result())
+        _appointment_types = _escape_template(appointment_types_future.result())
+        _schedules = _escape_template(schedules_future.result())
+
+    return Template(f"""
         # System Instructions for Voice Agent
         
         You are a friendly pet appointment booking assistant for voice calls at a veterinary hospital.
@@ -38,8 +89,8 @@ SYSTEM_INSTRUCTION_VOICE = (
         - MORNING: 7am to 12pm.
         - AFTERNOON: 12pm to 17pm.
         - EVENING: 17pm to 7pm.
-        - The date today is {datetime.now().strftime("%A, %d of %B %Y")}.
-        - The time now is {datetime.now().strftime("%H:%M")}.
+        - The date today is ${{date}}.
+        - The time now is ${{time}}.
         - If the time now is after 7pm then do not schedule appointments for today.
         
         ## Best Practices:
@@ -53,37 +104,32 @@ SYSTEM_INSTRUCTION_VOICE = (
         ## Information Collection (ask sequentially):
         1. Start by greeting the user based on time of the day and ask "How can I help you?"
             - Only respond in English. Never use any other language.
-            - Murmors and expressions such as "Um", "Hmm" are not relevant responses, nor are other common responses such as "Thanks", "Thank you", "Love", "Oh", "Bye" etc valid.
             - A relevant response would be e.g. "I would like to book an appointment" or "I need my cat to be seen by a vet".
             - Proceed to the next step ONLY if the user's intent is to schedule an appointment - e.g. "I would like to book an appointment".
             - If the user intention is for anything else, request them to call the hospital directly.
 
         2. If the user has clearly shown intent to make an appointment, and has NOT provided the type of the pet, ask who the appointment is for without mentioning the available options.
-            - Murmors and expressions such as "Um", "Hmm" are not relevant responses, nor are other common responses such as "Thanks", "Thank you", "Love", "Oh", "Bye" etc valid responses to questions.
-            - If the user has already given the name of the pet e.g. "Bella" then don't again ask who the appointment is for, but instead clarify which option from {API().get_species()} the pet belongs to.
+            - If the user has already given the name of the pet e.g. "Bella" then don't again ask who the appointment is for, but instead clarify which option from {_species} the pet belongs to.
             - If the user has already given the breed of the pet e.g. "German Shepherd", then infer the species from the breed and confirm with the user. Wait for the user to confirm before proceeding to the next step.
-            - If the user responded with a choice not in {API().get_species()}, then ask the user to call the hospotal directly. Also offer to continue if they wish to book for a {API().get_species()}.
+            - If the user responded with a choice not in {_species}, then ask the user to call the hospotal directly. Also offer to continue if they wish to book for a {_species}.
         
         3. If the user hasn't given the purpose of the appointment then ask the purpose of the appointment. Don't initially disclose the available options to the user.
-            - Murmors and expressions such as "Um", "Hmm" are not relevant responses, nor are other common responses such as "Thanks", "Thank you", "Love", "Oh", "Bye" etc valid responses to questions.
             - A relevant response could be the name of the appointment type e.g. "Vaccinations", "Consultation", or the description of the purpose of the appointment e.g. "my cat is not eating well" or "my dog is due for a check-up".
-            - If the user provided a description of the purpose, then if an appropriate option from {API().get_appointment_types()} is available, suggest it to the user and ask if they would like to proceed with that.
-            - If the user requested an appointment type that is not in {API().get_appointment_types()}, then inform that the requested appointment type is not available, but check whether any of the other options in {API().get_appointment_types()} would be suitable.
+            - If the user provided a description of the purpose, then if an appropriate option from {_appointment_types} is available, suggest it to the user and ask if they would like to proceed with that.
+            - If the user requested an appointment type that is not in {_appointment_types}, then inform that the requested appointment type is not available, but check whether any of the other options in {_appointment_types} would be suitable.
         
         4. Only if a specific clinician hasn't been requested already by the user, ask "Would you like to see a specific doctor?" without mentioning the options. 
             - It is more important to wait for a relevant response to the last question before proceeding to the next question.
-            - Murmors and expressions such as "Um", "Hmm" are not relevant responses, nor are other common responses such as "Thanks", "Thank you", "Love", "Oh", "Bye" etc valid responses to questions.
             - A relevant response could be the name of the clinician e.g. "Dr Michael", or indication of no preference e.g. "anyone" or "no preference".
-            - If the user has already requested a clinician that is available in {API().get_schedules()}, then don't ask the question again.
-            - If the user responds "Yes" then directly offer the options from {API().get_schedules()} by saying "We have". Do not again say "Which doctor would you like to see?"
-            - If the user response with a choice not in {API().get_schedules()}, then ask the user to choose from {API().get_schedules()}.
-            - If the user says "anyone" or "no preference" then select the first option from {API().get_schedules()}.
+            - If the user has already requested a clinician that is available in {_schedules}, then don't ask the question again.
+            - If the user responds "Yes" then directly offer the options from {_schedules} by saying "We have". Do not again say "Which doctor would you like to see?"
+            - If the user response with a choice not in {_schedules}, then ask the user to choose from {_schedules}.
+            - If the user says "anyone" or "no preference" then select the first option from {_schedules}.
         
         5. Only if the user has already indicated a prefered date and time, then identify the preferred date and time for the appointment by specifically asking "When would you like to come?".
             - It is more important to wait for a relevant response to the last question before proceeding to the next question.
-            - Murmors and expressions such as "Um", "Hmm" are not relevant responses, nor are other common responses such as "Thanks", "Thank you", "Love", "Oh", "Bye" etc valid responses to questions.        
             - A relevant response could be a specific date or a relative date such as "next Saturday", "next week", combined with a time such as "10am" or "2pm" or a time of day such as "Morning" or "Evening".
-            - If the user provides a relative date, e.g. "next Saturday", then calculate the date based on current date as {datetime.now().strftime("%A, %d of %B %Y")}.
+            - If the user provides a relative date, e.g. "next Saturday", then calculate the date based on current date as ${{date}}.
             - If the user is looking for a immediate appointment -e.g "Now", "Today", "First available", first make sure it is not for an emergency.
             - Appointments cannot be scheduled for past dates.
            
@@ -92,17 +138,16 @@ SYSTEM_INSTRUCTION_VOICE = (
             - Only offer up to three matching times. Never more than three time slots.
             - Choose three time slots from the available times to offer the best spread of slots within the selceted part of the day - i.e. Morning or Evening.
             - It is more important to wait for a relevant selection of time slots from the available times than to proceed to the next question.
-            - Murmors and expressions such as "Um", "Hmm" are not relevant responses, nor are other common responses such as "Thanks", "Thank you", "Love", "Oh", "Bye" etc valid.
             - A relevant response would be the selection of time slots e.g. "10am", "2.30pm", "7pm".
                                          
         7. Once the user has selected the time slot, always re-confirm the details collected so far and check whether the user would like to proceed with the booking.
             - Make sure to specifically mention the date in the format of -  e.g. Sunday 1st of October.
             - Always inform the user to hold until the booking is placed.
 
-        - Use {FIRST_NAME} as [first name].
-        - Use {LAST_NAME} as [last name].
-        - Use {NAME} as [name].
-        - Use {NOTES} as [notes].
+        - Use {BOOKING_IDENTITY.first_name} as [first name].
+        - Use {BOOKING_IDENTITY.last_name} as [last name].
+        - Use {BOOKING_IDENTITY.name} as [name].
+        - Use {BOOKING_IDENTITY.notes} as [notes].
 
         Use "place_appointment" tool to complete the booking.
         Once the appointment is successfully booked, inform the user that a confirmation email will follow. NEVER readout the confirmation reference. NEVER say to the user that the connection will be closed.".
@@ -114,14 +159,166 @@ SYSTEM_INSTRUCTION_VOICE = (
         - Inconsistencies: "I noticed something that might not be right about [detail]. Could we clarify?"
         
         IMPORTANT: Record the user's exact information without paraphrasing, even if unusual.
-        """
-)
-VOICE = 'Gacrux'
-MODEL = 'gemini-2.5-flash-native-audio-preview-12-2025'
-LOG_EVENT_TYPES = [
+        """)
+
+
+# Matches what string.Template substitutes in the JSON-encoded prompt, an
+# escaped "$$" or a ${date} / ${time} placeholder; JSON never escapes "$"
+_PLACEHOLDER_PATTERN = re.compile(rb"\$(?:\$|\{(date|time)\})")
+
+
+def _split_template_json(template_json):
+    """
+    Split the JSON-encoded template into static bytes (even indices) and
+    placeholder names (odd indices), unescaping "$$" the way Template does.
+    """
+    parts = []
+    static = bytearray()
+    position = 0
+    for match in _PLACEHOLDER_PATTERN.finditer(template_json):
+        static += template_json[position:match.start()]
+        position = match.end()
+        if match.group(1) is None:
+            static += b"$"
+        else:
+            parts.append(bytes(static))
+            parts.append(match.group(1))
+            static.clear()
+    static += template_json[position:]
+    parts.append(bytes(static))
+    return parts
+
+
+@functools.lru_cache(maxsize=8)
+def _format_date(year, month, day):
+    return date(year, month, day).strftime("%A, %d of %B %Y")
+
+
+def _prompt_fields():
+    now = datetime.now()
+    return {
+        "date": _format_date(now.year, now.month, now.day),
+        "time": f"{now.hour:02d}:{now.minute:02d}",
+    }
+
+
+class _SystemInstructionCache:
+    """
+    Holds the prompt template and its JSON-encoded parts, rebuilding both
+    from fresh clinic options once the TTL has passed. If the clinic options
+    cannot be fetched, the previous prompt is kept and the fetch retried
+    after retry_delay.
+    """
+
+    def __init__(self, ttl: float, retry_delay: float):
+        self._ttl = ttl
+        self._retry_delay = retry_delay
+        self._lock = threading.Lock()
+        self._entry = None  # (expires_at, template, json_parts)
+
+    def is_fresh(self):
+        entry = self._entry
+        return entry is not None and entry[0] > time.monotonic()
+
+    def get(self):
+        entry = self._entry
+        if entry is not None and entry[0] > time.monotonic():
+            return entry
+        with self._lock:
+            entry = self._entry
+            if entry is None or entry[0] <= time.monotonic():
+                try:
+                    template = _build_system_instruction()
+                except Exception as e:
+                    if entry is None:
+                        raise
+                    print(f"Warning: failed to refresh the clinic options, keeping the previous prompt: {e}")
+                    entry = self._entry = (time.monotonic() + self._retry_delay, *entry[1:])
+                    return entry
+                # Even indices hold read-only views of the static bytes, odd
+                # indices hold placeholder names
+                json_parts = tuple(
+                    part if index % 2 else memoryview(part).toreadonly()
+                    for index, part in enumerate(_split_template_json(orjson.dumps(template.template)))
+                )
+                entry = self._entry = (time.monotonic() + self._ttl, template, json_parts)
+            return entry
+
+    def invalidate(self):
+        # Expire the entry but keep it as the fallback if the refetch fails
+        entry = self._entry
+        if entry is not None:
+            self._entry = (0.0, *entry[1:])
+
+
+_system_instruction_cache = _SystemInstructionCache(CLINIC_OPTIONS_CACHE_TTL, CLINIC_OPTIONS_RETRY_DELAY)
+
+
+def invalidate_api_caches():
+    """
+    Drop the cached clinic options so the next session refetches them, e.g.
+    after the clinic updates its schedules.
+    """
+    _system_instruction_cache.invalidate()
+
+
+def get_system_instruction():
+    """
+    Render the voice agent prompt with the current date and time.
+    """
+    _, template, _ = _system_instruction_cache.get()
+    return template.substitute(_prompt_fields())
+
+
+def get_system_instruction_chunks():
+    """
+    Render the voice agent prompt as the buffers of an encoded JSON string:
+    shared views of the static text with the current date and time between
+    them. Join them straight into the outgoing payload to copy the static
+    text only once.
+    """
+    fields = {name.encode(): orjson.dumps(value)[1:-1] for name, value in _prompt_fields().items()}
+    _, _, json_parts = _system_instruction_cache.get()
+    chunks = list(json_parts)
+    chunks[1::2] = [fields[name] for name in chunks[1::2]]
+    return chunks
+
+
+async def aget_system_instruction_chunks():
+    """
+    Async get_system_instruction_chunks for the event loop. While the cached
+    prompt is fresh it renders immediately; otherwise the clinic options are
+    fetched on a worker thread so the loop isn't blocked.
+    """
+    if not _system_instruction_cache.is_fresh():
+        await asyncio.to_thread(_system_instruction_cache.get)
+    return get_system_instruction_chunks()
+
+
+def get_system_instruction_json():
+    """
+    Render the voice agent prompt as an encoded JSON string with the current
+    date and time, ready to splice into a serialized payload without
+    re-escaping the static text.
+    """
+    return b"".join(get_system_instruction_chunks())
+
+
+VOICE = sys.intern('Gacrux')
+MODEL = sys.intern('gemini-2.5-flash-native-audio-preview-12-2025')
+LOG_EVENT_TYPES = frozenset({
     'error', 'response.content.done', 'rate_limits.updated',
     'response.done', 'input_audio_buffer.committed',
     'input_audio_buffer.speech_stopped', 'input_audio_buffer.speech_started',
     'session.created'
-]
+})
 SHOW_TIMING_MATH = False
+
+
+def __getattr__(name):
+    # SYSTEM_INSTRUCTION_VOICE is rendered on access so importing the other
+    # constants does not call the Vetstoria API. Prefer get_system_instruction()
+    # per session; a value imported at module load keeps that moment's date.
+    if name == "SYSTEM_INSTRUCTION_VOICE":
+        return get_system_instruction()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
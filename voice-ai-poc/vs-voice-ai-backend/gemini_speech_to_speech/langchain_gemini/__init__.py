@@ -1,11 +1,13 @@
 import asyncio
 import json
 import base64
+import functools
+import orjson
 import websockets
 import numpy as np
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator, AsyncIterator, Any, Callable, Coroutine, Optional
-from gemini_speech_to_speech.constants_gemini import SYSTEM_INSTRUCTION_VOICE
+from gemini_speech_to_speech.constants_gemini import aget_system_instruction_chunks
 
 from .utils import amerge
 from langchain_core.tools import BaseTool
@@ -58,30 +60,43 @@ DEFAULT_URL = "wss://generativelanguage.googleapis.com/ws/google.ai.generativela
 GEMINI_INPUT_SAMPLE_RATE = 16000  # Gemini input audio sample rate
 GEMINI_OUTPUT_SAMPLE_RATE = 24000  # Gemini output audio sample rate
 TARGET_SAMPLE_RATE = 24000  # Target sample rate for client
+RESAMPLE_BUFFER_BYTES = 16 * 1024  # Reusable resample output buffer, larger frames allocate their own
 
 
-def resample_audio(audio_bytes: bytes, from_rate: int, to_rate: int) -> bytes:
+def resample_audio(
+    audio_bytes: bytes,
+    from_rate: int,
+    to_rate: int,
+    out: Optional[bytearray] = None,
+) -> bytes | bytearray | memoryview:
     """
     Resample audio from one sample rate to another.
     
+    The float stages run in place and the result is written straight into a
+    byte buffer. Pass a reusable `out` bytearray to avoid allocating one per
+    call; the returned memoryview is then only valid until `out` is reused.
+    
     Args:
         audio_bytes: Raw PCM16 audio bytes (little-endian, mono)
         from_rate: Source sample rate
         to_rate: Target sample rate
+        out: Optional reusable output buffer, used when it is large enough
     
     Returns:
-        Resampled audio bytes (PCM16, little-endian, mono)
+        Resampled audio (PCM16, little-endian, mono): a memoryview into `out`,
+        a new bytearray, or the input unchanged if resampling was skipped
     """
     if not SCIPY_AVAILABLE:
         print("Warning: scipy not available, returning original audio without resampling")
         return audio_bytes
     
     try:
-        # Convert bytes to numpy array (int16, little-endian)
+        # Zero-copy int16 view of the input (little-endian)
         audio_array = np.frombuffer(audio_bytes, dtype=np.int16)
         
         # Convert to float32 for processing (normalize to [-1, 1])
-        audio_float = audio_array.astype(np.float32) / 32768.0
+        audio_float = audio_array.astype(np.float32)
+        audio_float *= 1.0 / 32768.0
         
         # Calculate the number of samples after resampling
         num_samples = len(audio_float)
@@ -90,24 +105,57 @@ def resample_audio(audio_bytes: bytes, from_rate: int, to_rate: int) -> bytes:
         # Resample using scipy.signal.resample
         resampled_float = signal.resample(audio_float, target_samples)
         
-        # Ensure values are in valid range [-1, 1]
-        resampled_float = np.clip(resampled_float, -1.0, 1.0)
-        
-        # Convert back to int16
-        resampled_int16 = (resampled_float * 32768.0).astype(np.int16)
+        # Ensure values are in valid range [-1, 1], then scale to int16, in place
+        np.clip(resampled_float, -1.0, 1.0, out=resampled_float)
+        resampled_float *= 32768.0
         
-        # Convert back to bytes (little-endian)
-        resampled_bytes = resampled_int16.tobytes()
+        # Convert into a writable int16 view over the output buffer
+        target_bytes = target_samples * 2
+        buffer = out if out is not None and len(out) >= target_bytes else bytearray(target_bytes)
+        resampled_int16 = np.frombuffer(buffer, dtype=np.int16, count=target_samples)
+        resampled_int16[:] = resampled_float
         
-        return resampled_bytes
+        return memoryview(buffer)[:target_bytes] if buffer is out else buffer
     
     except Exception as e:
         print(f"Error resampling audio: {e}, returning original audio")
         return audio_bytes
 
 
+# Stands in for the system instruction while the setup envelope is serialized
+SYSTEM_INSTRUCTION_SLOT = "\x00system_instruction\x00"
+
+
+@functools.lru_cache(maxsize=8)
+def setup_message_parts(model: str) -> tuple[bytes, bytes]:
+    """
+    Serialize the setup message once per model and split it where the
+    JSON-encoded system instruction goes.
+    """
+    model_setup = {
+        "model": f"models/{model}",
+        "generation_config": {
+            "response_modalities": ["AUDIO"],
+            "speech_config": {
+                "voice_config": {"prebuilt_voice_config": {"voice_name": "Gacrux"}}
+            },
+        },
+        # The Live setup message has no cached-content handle, so the prompt is
+        # sent on every session; it is pre-encoded to keep that cheap
+        "system_instruction": {
+            "parts": [
+                {
+                    "text": SYSTEM_INSTRUCTION_SLOT,
+                }
+            ]
+        } 
+    }
+    head, tail = orjson.dumps({"setup": model_setup}).split(orjson.dumps(SYSTEM_INSTRUCTION_SLOT))
+    return head, tail
+
+
 @asynccontextmanager
-async def connect(*, api_key: str, model: str, url: str) -> AsyncGenerator[
+async def connect(*, api_key: str, model: str, url: str, instructions: str | None = None) -> AsyncGenerator[
     tuple[
         Callable[[dict[str, Any] | str], Coroutine[Any, Any, None]],
         AsyncIterator[dict[str, Any]],
@@ -121,6 +169,7 @@ async def connect(*, api_key: str, model: str, url: str) -> AsyncGenerator[
         api_key: Gemini API key
         model: The model to use (e.g., "gemini-2.0-flash-exp")
         url: WebSocket URL
+        instructions: System instruction; the pre-encoded prompt template is rendered when omitted
     """
     ws_url = f"{url}?key={api_key}"
     
@@ -128,28 +177,15 @@ async def connect(*, api_key: str, model: str, url: str) -> AsyncGenerator[
         "Content-Type": "application/json"
     }
 
-    model_setup = {
-        "model": f"models/{model}",
-        "generation_config": {
-            "response_modalities": ["AUDIO"],
-            "speech_config": {
-                "voice_config": {"prebuilt_voice_config": {"voice_name": "Gacrux"}}
-            },
-        },
-        "system_instruction": {
-            "parts": [
-                {
-                    "text": SYSTEM_INSTRUCTION_VOICE,
-                }
-            ]
-        } 
-    }
+    head, tail = setup_message_parts(model)
+    instructions_chunks = (orjson.dumps(instructions),) if instructions else await aget_system_instruction_chunks()
+    setup_message = b"".join((head, *instructions_chunks, tail))
 
     websocket = await websockets.connect(ws_url, additional_headers=headers)
 
     try:
         # Send setup message
-        await websocket.send(json.dumps({"setup": model_setup}))
+        await websocket.send(setup_message, text=True)
         # Wait for initial response
         await websocket.recv()
         print("Connected to Gemini, You can start talking now")
@@ -271,6 +307,8 @@ class GeminiVoiceReactAgent(BaseModel):
     url: str = Field(default=DEFAULT_URL)
     voice: str = Field(default=DEFAULT_VOICE)
     _model_speaking: bool = PrivateAttr(default=False)
+    # Reused by resample_audio for every mic frame
+    _resample_buffer: bytearray = PrivateAttr(default_factory=lambda: bytearray(RESAMPLE_BUFFER_BYTES))
 
     async def aconnect(
         self,
@@ -295,7 +333,8 @@ class GeminiVoiceReactAgent(BaseModel):
         async with connect(
             api_key=self.api_key.get_secret_value(),
             model=self.model,
-            url=self.url
+            url=self.url,
+            instructions=self.instructions,
         ) as (
             model_send,
             model_receive_stream,
@@ -373,7 +412,8 @@ class GeminiVoiceReactAgent(BaseModel):
                         resampled_audio = resample_audio(
                             audio_bytes,
                             from_rate=TARGET_SAMPLE_RATE,
-                            to_rate=GEMINI_INPUT_SAMPLE_RATE
+                            to_rate=GEMINI_INPUT_SAMPLE_RATE,
+                            out=self._resample_buffer,
                         )
                         
                         # Encode back to base64 for Gemini
@@ -1,7 +1,6 @@
 from fastapi import APIRouter, Request, Depends
 from starlette.websockets import WebSocket
 
-from .constants_gemini import SYSTEM_INSTRUCTION_VOICE
 from .langchain_gemini import GeminiVoiceReactAgent
 from utils.tools import TOOLS_ARRAY, current_websocket, appointment_booked, current_conversation_id
 from .websocket_utils import websocket_stream
@@ -47,7 +46,7 @@ async def websocket_endpoint(websocket: WebSocket):
     agent = GeminiVoiceReactAgent(
         model="gemini-2.5-flash-native-audio-preview-12-2025",
         # tools=TOOLS_ARRAY,
-        instructions=SYSTEM_INSTRUCTION_VOICE,
+        # instructions default to the pre-encoded prompt rendered per connection
     )
 
     try:
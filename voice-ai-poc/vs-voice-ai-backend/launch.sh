@@ -81,7 +81,7 @@ else
         pip install --upgrade pip
         # Install dependencies from pyproject.toml if possible, otherwise install manually
         if [ -f "pyproject.toml" ]; then
-            pip install fastapi uvicorn websockets twilio python-dotenv langchain-community langgraph langchain-openai python-multipart noisereduce numpy boto3 aws-sdk-bedrock-runtime
+            pip install fastapi uvicorn websockets twilio python-dotenv langchain-community langgraph langchain-openai python-multipart noisereduce numpy orjson boto3 aws-sdk-bedrock-runtime
         fi
     fi
     
@@ -1,35 +1,32 @@
 """
 Audio processing utilities for noise reduction using spectral gating.
 """
-import base64
+from binascii import a2b_base64, b2a_base64
 import numpy as np
 import noisereduce as nr
 from typing import Optional
 
 
-def process_audio_with_spectral_gating(
-    base64_audio: str,
+def reduce_noise_pcm(
+    audio_bytes: bytes,
     sample_rate: int = 24000,
     stationary: bool = False,
     prop_decrease: float = 0.8,
-) -> str:
+) -> bytes:
     """
-    Process audio with spectral gating using noisereduce to reduce noise.
+    Process raw PCM16 audio with spectral gating using noisereduce to reduce noise.
     
     Args:
-        base64_audio: Base64-encoded audio data (PCM16, 24kHz, mono)
-        sample_rate: Sample rate of the audio (default: 24000 for OpenAI Realtime API)
+        audio_bytes: Raw audio data (PCM16, little-endian, mono)
+        sample_rate: Sample rate of the audio (default: 24000)
         stationary: If True, uses stationary noise reduction (better for consistent noise)
                    If False, uses non-stationary reduction (better for varying noise)
         prop_decrease: Proportion of noise to reduce (0.0 to 1.0, default: 0.8)
     
     Returns:
-        Base64-encoded processed audio data
+        Processed raw audio data (PCM16, little-endian, mono)
     """
     try:
-        # Decode base64 audio to bytes
-        audio_bytes = base64.b64decode(base64_audio)
-        
         # Convert bytes to numpy array (int16, little-endian)
         audio_array = np.frombuffer(audio_bytes, dtype=np.int16)
         
@@ -48,17 +45,50 @@ def process_audio_with_spectral_gating(
         processed_audio = (reduced_noise * 32768.0).astype(np.int16)
         
         # Convert back to bytes (little-endian)
-        processed_bytes = processed_audio.tobytes()
-        
-        # Encode back to base64
-        processed_base64 = base64.b64encode(processed_bytes).decode('utf-8')
-        
-        return processed_base64
+        return processed_audio.tobytes()
     
     except Exception as e:
         # If processing fails, return original audio
         print(f"Error processing audio with spectral gating: {e}")
+        return audio_bytes
+
+
+def process_audio_with_spectral_gating(
+    base64_audio: str,
+    sample_rate: int = 24000,
+    stationary: bool = False,
+    prop_decrease: float = 0.8,
+) -> str:
+    """
+    Process audio with spectral gating using noisereduce to reduce noise.
+    
+    Args:
+        base64_audio: Base64-encoded audio data (PCM16, 24kHz, mono)
+        sample_rate: Sample rate of the audio (default: 24000 for OpenAI Realtime API)
+        stationary: If True, uses stationary noise reduction (better for consistent noise)
+                   If False, uses non-stationary reduction (better for varying noise)
+        prop_decrease: Proportion of noise to reduce (0.0 to 1.0, default: 0.8)
+    
+    Returns:
+        Base64-encoded processed audio data
+    """
+    try:
+        # Decode base64 audio to bytes
+        audio_bytes = a2b_base64(base64_audio)
+    except Exception as e:
+        # If decoding fails, return original audio
+        print(f"Error processing audio with spectral gating: {e}")
         return base64_audio
+    
+    processed_bytes = reduce_noise_pcm(
+        audio_bytes,
+        sample_rate=sample_rate,
+        stationary=stationary,
+        prop_decrease=prop_decrease,
+    )
+    
+    # Encode back to base64
+    return b2a_base64(processed_bytes, newline=False).decode('ascii')
 
 
 def reduce_gain_pcm(
@@ -80,7 +110,7 @@ def reduce_gain_pcm(
     """
     try:
         # Decode base64 audio to bytes
-        audio_bytes = base64.b64decode(base64_audio)
+        audio_bytes = a2b_base64(base64_audio)
         
         # Convert bytes to numpy array (int16, little-endian)
         audio_array = np.frombuffer(audio_bytes, dtype=np.int16)
@@ -101,7 +131,7 @@ def reduce_gain_pcm(
         processed_bytes = processed_audio.tobytes()
         
         # Encode back to base64
-        processed_base64 = base64.b64encode(processed_bytes).decode('utf-8')
+        processed_base64 = b2a_base64(processed_bytes, newline=False).decode('ascii')
         
         return processed_base64
     
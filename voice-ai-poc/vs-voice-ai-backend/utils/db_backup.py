@@ -1,5 +1,8 @@
 import os
 import logging
+import sqlite3
+import tempfile
+from contextlib import closing
 from datetime import datetime
 from pathlib import Path
 import boto3
@@ -28,18 +31,25 @@ def upload_db_to_s3() -> bool:
         timestamp = now.strftime('%Y-%m-%d_%H-%M-%S')
         s3_key = f"{now.strftime('%Y/%m/%d/%H')}/voice-ai_{timestamp}.db"
         
-        logger.info(f"Uploading database to s3://{S3_BUCKET}/{s3_key}")
-        s3_client.upload_file(
-            str(DB_PATH),
-            S3_BUCKET,
-            s3_key,
-            ExtraArgs={
-                'Metadata': {
-                    'backup-timestamp': timestamp,
-                    'backup-type': 'scheduled'
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # The app keeps writing (WAL mode) during the upload, so copy a
+            # consistent snapshot with the online backup API and upload that
+            snapshot_path = Path(tmp_dir) / DB_PATH.name
+            with closing(sqlite3.connect(DB_PATH)) as source, closing(sqlite3.connect(snapshot_path)) as snapshot:
+                source.backup(snapshot)
+            
+            logger.info(f"Uploading database to s3://{S3_BUCKET}/{s3_key}")
+            s3_client.upload_file(
+                str(snapshot_path),
+                S3_BUCKET,
+                s3_key,
+                ExtraArgs={
+                    'Metadata': {
+                        'backup-timestamp': timestamp,
+                        'backup-type': 'scheduled'
+                    }
                 }
-            }
-        )
+            )
         
         logger.info(f"Successfully uploaded database to S3: {s3_key}")
         return True
@@ -16,6 +16,14 @@ _project_root = _current_file.parent.parent
 DB_PATH = _project_root / "data" / "voice-ai.db"
 
 
+def remove_wal_files() -> None:
+    """Remove SQLite WAL/shared-memory files left next to the database, which must not be applied to a restored file."""
+    for suffix in ("-wal", "-shm"):
+        sidecar = DB_PATH.with_name(DB_PATH.name + suffix)
+        if sidecar.exists():
+            sidecar.unlink()
+
+
 def list_backups(limit: int = 10) -> list:
     """List available database backups from S3, sorted by date (newest first)."""
     try:
@@ -116,6 +124,7 @@ def restore_latest_backup(backup_current: bool = True) -> bool:
     try:
         if DB_PATH.exists():
             DB_PATH.unlink()
+        remove_wal_files()
         
         temp_download_path.rename(DB_PATH)
         logger.info(f"Database restored successfully from {latest_key}")
@@ -166,6 +175,7 @@ def restore_specific_backup(s3_key: str, backup_current: bool = True) -> bool:
     try:
         if DB_PATH.exists():
             DB_PATH.unlink()
+        remove_wal_files()
         
         temp_download_path.rename(DB_PATH)
         logger.info(f"Database restored successfully from {s3_key}")
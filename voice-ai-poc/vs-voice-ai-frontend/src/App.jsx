@@ -3,6 +3,16 @@ import './App.css'
 
 const BUFFER_SIZE = 4800
 
+// Providers that exchange audio as binary WebSocket frames instead of base64 JSON
+const BINARY_AUDIO_PROVIDERS = new Set(['assemblyai'])
+
+// Binary frames from the server are [u32 LE header length][JSON header][PCM16 audio]
+const parseBinaryFrame = (buffer) => {
+  const headerLength = new DataView(buffer).getUint32(0, true)
+  const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 4, headerLength)))
+  return { header, payload: buffer.slice(4 + headerLength) }
+}
+
 // Player class for audio playback
 class Player {
   constructor() {
@@ -109,6 +119,7 @@ function App() {
   const analyserContextRef = useRef(null)
   const animationFrameRef = useRef(null)
   const mediaStreamRef = useRef(null)
+  const binaryAudioRef = useRef(false)
 
   const baseWS_URL = import.meta.env.VITE_WS_URL || 'ws://localhost:8000/voice/browser/media-stream'
 
@@ -259,6 +270,12 @@ function App() {
       const toSend = new Uint8Array(audioBufferRef.current.slice(0, BUFFER_SIZE))
       audioBufferRef.current = new Uint8Array(audioBufferRef.current.slice(BUFFER_SIZE))
 
+      if (binaryAudioRef.current) {
+        // Send raw PCM16 as a binary frame
+        wsRef.current.send(toSend.buffer)
+        return
+      }
+
       // Convert to base64
       const regularArray = Array.from(toSend)
       const base64 = btoa(String.fromCharCode(...regularArray))
@@ -292,6 +309,8 @@ function App() {
       const url = new URL(wsURL)
       url.searchParams.set('api_key', currentApiKey)
       const ws = new WebSocket(url.toString())
+      ws.binaryType = 'arraybuffer'
+      binaryAudioRef.current = BINARY_AUDIO_PROVIDERS.has(selectedProvider)
       wsRef.current = ws
 
       const handleOpen = async () => {
@@ -347,6 +366,17 @@ function App() {
 
       const handleMessage = (event) => {
         try {
+          if (event.data instanceof ArrayBuffer) {
+            const { header, payload } = parseBinaryFrame(event.data)
+            if (header?.type === 'response.audio.delta') {
+              setIsSpeaking(true)
+              audioPlayer.play(new Int16Array(payload))
+            } else {
+              console.log('Received binary message:', header)
+            }
+            return
+          }
+
           const data = JSON.parse(event.data)
 
           // Handle response.audio.delta messages